@@ -8,7 +8,11 @@ Flask application providing RAG-powered academic paper Q&A
 
 import os
 import json
+import uuid
+import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from flask import Flask, request, jsonify, send_from_directory
@@ -16,7 +20,8 @@ from flask_cors import CORS
 from werkzeug.utils import secure_filename
 
 from document_processor import DocumentProcessor
-from rag_engine import RAGEngine
+from rag_engine import RAGEngine, StagingBuffer
+from upload_registry import UploadRegistry
 from logging_config import setup_logging
 import sys
 
@@ -49,6 +54,11 @@ UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'uploads')
 ALLOWED_EXTENSIONS = {'pdf'}  # Only PDF for academic papers
 MAX_CONTENT_LENGTH = 50 * 1024 * 1024  # 50MB for academic papers
 
+# GROBID parses PDFs remotely, so extraction threads mostly wait on HTTP;
+# bounded so a large batch upload doesn't swamp the GROBID service
+GROBID_CONCURRENCY = int(os.environ.get('GROBID_CONCURRENCY', 4))
+extraction_pool = ThreadPoolExecutor(max_workers=GROBID_CONCURRENCY, thread_name_prefix='grobid')
+
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
@@ -59,25 +69,57 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 # Initialize processors
 document_processor = DocumentProcessor()
 
-# Initialize RAG engine (lazy loaded)
-_rag_engine = None
+# Content hashes of ingested files, so re-uploading one skips GROBID and embedding
+upload_registry = UploadRegistry(os.environ.get('UPLOAD_REGISTRY_PATH', './upload_registry.db'))
+
+# Read size when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Chunks staged from a batch upload before they are embedded together
+BATCH_EMBED_CHUNKS = 256
+
+# Initialize RAG engine (lazy loaded into app.extensions, shared by all routes
+# and request threads so there is only ever one Chroma client per process)
+_rag_engine_lock = threading.Lock()
 
 def get_rag_engine():
-    """Get or create RAG engine instance"""
-    global _rag_engine
-    if _rag_engine is None:
+    """Get or create the RAG engine shared by every route"""
+    rag = app.extensions.get('rag_engine')
+    if rag is not None:
+        return rag
+    
+    with _rag_engine_lock:
+        # Another thread may have finished initializing while we waited
+        rag = app.extensions.get('rag_engine')
+        if rag is not None:
+            return rag
+        
         try:
             logger.info("Initializing RAG engine...")
-            _rag_engine = RAGEngine(
+            rag = RAGEngine(
                 vector_store_path=os.environ.get('VECTOR_STORE_PATH', './chroma_db'),
                 embedding_model=os.environ.get('EMBEDDING_MODEL', 'BAAI/bge-large-en-v1.5'),
-                llm_api_key=os.environ.get('GEMINI_API_KEY')
+                llm_api_key=os.environ.get('GEMINI_API_KEY'),
+                result_cache_path=os.environ.get('RESULT_CACHE_PATH', './query_cache.db'),
+                embedding_backend=os.environ.get('EMBEDDING_BACKEND', 'sentence-transformers'),
+                vector_store_backend=os.environ.get('VECTOR_STORE_BACKEND', 'chroma'),
+                use_pq=os.environ.get('VECTOR_STORE_PQ', 'False').lower() == 'true',
+                use_pca=os.environ.get('VECTOR_STORE_PCA', 'False').lower() == 'true',
+                query_batch_window_ms=float(os.environ.get('QUERY_BATCH_WINDOW_MS', 0))
             )
+            app.extensions['rag_engine'] = rag
             logger.info("RAG engine initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing RAG engine: {e}")
             raise
-    return _rag_engine
+    return rag
+
+def warm_up_rag_engine():
+    """Build the RAG engine ahead of the first request (models load, HNSW warms up)"""
+    try:
+        get_rag_engine()
+    except Exception as e:
+        logger.warning(f"RAG engine warmup failed; it will be retried on first request: {e}")
 
 def allowed_file(filename):
     """Check if file has an allowed extension"""
@@ -152,6 +194,49 @@ def query_papers():
             'error': str(e)
         }), 500
 
+def save_upload(file):
+    """
+    Stream an uploaded file to disk under a timestamped name, hashing it in the same pass
+    
+    A random suffix keeps files with the same name in one batch (or the same
+    second) from overwriting each other.
+    
+    Returns:
+        Tuple of (filename, file_path, sha256 hex digest)
+    """
+    filename = secure_filename(file.filename)
+    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    filename_with_timestamp = f"{timestamp}_{uuid.uuid4().hex[:8]}_{filename}"
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename_with_timestamp)
+    
+    digest = hashlib.sha256(usedforsecurity=False)
+    with open(file_path, 'wb') as out:
+        while chunk := file.stream.read(UPLOAD_CHUNK_SIZE):
+            out.write(chunk)
+            digest.update(chunk)
+    
+    logger.info(f"File saved: {file_path}")
+    return filename, file_path, digest.hexdigest()
+
+def find_duplicate_upload(file_path, sha256):
+    """Return the recorded result if this content was already ingested, discarding the new copy"""
+    previous = upload_registry.get(sha256)
+    if previous is not None:
+        os.remove(file_path)
+        logger.info(f"Duplicate upload of paper {previous['paper_id']}, skipping ingestion")
+    return previous
+
+def upload_result(ingest_result, filename):
+    """Build the API result for a successfully ingested paper"""
+    return {
+        'paper_id': ingest_result['paper_id'],
+        'title': ingest_result['title'],
+        'chunks_processed': ingest_result['chunks_processed'],
+        'sections_processed': ingest_result['sections_processed'],
+        'filename': filename,
+        'upload_date': datetime.now().isoformat()
+    }
+
 @app.route('/upload', methods=['POST'])
 def upload_paper():
     """API endpoint to upload and ingest a paper into RAG system"""
@@ -180,13 +265,15 @@ def upload_paper():
             }), 400
         
         # Save file
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        filename_with_timestamp = f"{timestamp}_{filename}"
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename_with_timestamp)
+        filename, file_path, sha256 = save_upload(file)
         
-        file.save(file_path)
-        logger.info(f"File saved: {file_path}")
+        # Identical content was already ingested; return its result
+        previous = find_duplicate_upload(file_path, sha256)
+        if previous is not None:
+            return jsonify({
+                'status': 'ok',
+                'result': {**previous, 'duplicate': True}
+            })
         
         # Process file with GROBID
         paper_data = document_processor.process_file_for_rag(file_path)
@@ -209,16 +296,12 @@ def upload_paper():
                 'error': ingest_result.get('error', 'Failed to ingest paper')
             }), 500
         
+        result = upload_result(ingest_result, filename)
+        upload_registry.add(sha256, result)
+        
         return jsonify({
             'status': 'ok',
-            'result': {
-                'paper_id': ingest_result['paper_id'],
-                'title': ingest_result['title'],
-                'chunks_processed': ingest_result['chunks_processed'],
-                'sections_processed': ingest_result['sections_processed'],
-                'filename': filename,
-                'upload_date': datetime.now().isoformat()
-            }
+            'result': result
         })
     
     except Exception as e:
@@ -228,17 +311,137 @@ def upload_paper():
             'error': str(e)
         }), 500
 
+@app.route('/upload/batch', methods=['POST'])
+def upload_papers():
+    """API endpoint to upload several papers, extracting them with GROBID concurrently"""
+    try:
+        files = [file for file in request.files.getlist('files') if file.filename != '']
+        
+        if not files:
+            return jsonify({
+                'status': 'error',
+                'error': 'No files selected'
+            }), 400
+        
+        invalid = [file.filename for file in files if not allowed_file(file.filename)]
+        if invalid:
+            return jsonify({
+                'status': 'error',
+                'error': f'Only PDF files are allowed for academic papers: {", ".join(invalid)}'
+            }), 400
+        
+        saved = [save_upload(file) for file in files]
+        rag = get_rag_engine()
+        results = [None] * len(saved)
+        
+        # Stage each paper as soon as GROBID returns it and embed whenever
+        # enough chunks have built up, so embedding overlaps with extraction
+        # of the rest while still running in large batches
+        buffer = StagingBuffer()
+        staged = []
+        
+        def flush_staged():
+            # Cleared before flushing, so a failure can't leave indices behind
+            # to be paired with a later flush's results
+            indices = staged[:]
+            staged.clear()
+            for index, ingest_result in zip(indices, rag.flush(buffer)):
+                filename, _, sha256 = saved[index]
+                if not ingest_result.get('success'):
+                    results[index] = {
+                        'filename': filename,
+                        'status': 'error',
+                        'error': ingest_result.get('error', 'Failed to ingest paper')
+                    }
+                    continue
+                
+                result = upload_result(ingest_result, filename)
+                results[index] = {'status': 'ok', **result}
+                try:
+                    upload_registry.add(sha256, result)
+                except Exception as e:
+                    # The paper is stored; only duplicate detection misses it
+                    logger.error(f"Error recording upload of {filename}: {e}")
+        
+        futures = {}
+        # Files in this batch with identical content are ingested once; each
+        # later copy maps to the index of the first and reuses its result
+        first_copies = {}
+        copies = {}
+        for index, (_, file_path, sha256) in enumerate(saved):
+            previous = find_duplicate_upload(file_path, sha256)
+            if previous is not None:
+                results[index] = {'status': 'ok', **previous, 'duplicate': True}
+            elif sha256 in first_copies:
+                os.remove(file_path)
+                copies[index] = first_copies[sha256]
+            else:
+                first_copies[sha256] = index
+                futures[extraction_pool.submit(document_processor.process_file_for_rag, file_path)] = index
+        
+        for future in as_completed(futures):
+            index = futures[future]
+            filename = saved[index][0]
+            
+            try:
+                paper_data = future.result()
+                if 'error' in paper_data:
+                    results[index] = {'filename': filename, 'status': 'error', 'error': paper_data['error']}
+                    continue
+                
+                ingest_result = rag.stage_paper(buffer, paper_data)
+                if ingest_result is not None:
+                    results[index] = {
+                        'filename': filename,
+                        'status': 'error',
+                        'error': ingest_result.get('error', 'Failed to ingest paper')
+                    }
+                    continue
+                
+                staged.append(index)
+                if len(buffer) >= BATCH_EMBED_CHUNKS:
+                    flush_staged()
+            except Exception as e:
+                logger.error(f"Error processing {filename}: {e}")
+                results[index] = {'filename': filename, 'status': 'error', 'error': str(e)}
+        
+        flush_staged()
+        
+        for index, first in copies.items():
+            if results[first]['status'] == 'ok':
+                results[index] = {**results[first], 'duplicate': True}
+            else:
+                results[index] = {**results[first], 'filename': saved[index][0]}
+        
+        return jsonify({
+            'status': 'ok',
+            'results': results
+        })
+    
+    except Exception as e:
+        logger.error(f"Error uploading files: {e}")
+        return jsonify({
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
 @app.route('/papers', methods=['GET'])
 def list_papers():
-    """API endpoint to list all uploaded papers"""
+    """API endpoint to list uploaded papers, optionally one page at a time"""
     try:
+        limit = request.args.get('limit', type=int)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        if limit is not None:
+            limit = max(limit, 0)
+        
         rag = get_rag_engine()
-        papers = rag.list_papers()
+        papers = rag.list_papers(limit=limit, offset=offset)
+        paginated = limit is not None or offset > 0
         
         return jsonify({
             'status': 'ok',
             'papers': papers,
-            'total': len(papers)
+            'total': rag.count_papers() if paginated else len(papers)
         })
     
     except Exception as e:
@@ -256,6 +459,7 @@ def delete_paper(paper_id):
         success = rag.delete_paper(paper_id)
         
         if success:
+            upload_registry.remove_paper(paper_id)
             return jsonify({
                 'status': 'ok',
                 'message': f'Paper {paper_id} deleted successfully'
@@ -357,6 +561,9 @@ if __name__ == '__main__':
     # Get debug mode from environment or use default
     debug = os.environ.get('DEBUG', 'False').lower() == 'true'
     
+    # Load models and indexes in the background so startup isn't blocked
+    threading.Thread(target=warm_up_rag_engine, name="rag-warmup", daemon=True).start()
+    
     # Start server
     logger.info(f"Starting server on port {port}, debug={debug}")
     app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
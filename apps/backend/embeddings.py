@@ -3,16 +3,64 @@
 
 """
 Embeddings Module
-Generates embeddings using sentence transformers (BGE-large-en)
+Generates embeddings using sentence transformers (BGE-large-en) or ONNX Runtime
 """
 
 import os
+import json
 import logging
+import threading
 from typing import List, Union
-from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+# Pooling modes ONNXEmbeddingGenerator can reproduce, by sentence-transformers config flag
+_POOLING_MODES = {
+    "pooling_mode_cls_token": "cls",
+    "pooling_mode_mean_tokens": "mean"
+}
+
+
+def _pooling_mode(model_name: str) -> str:
+    """
+    Read how a sentence-transformers model pools token embeddings from its
+    1_Pooling/config.json (e.g. CLS for BGE, mean for MiniLM)
+    
+    Parameters:
+        model_name: Hugging Face model ID or local model directory
+    
+    Returns:
+        'cls' or 'mean'
+    
+    Raises:
+        ValueError: If the model uses a pooling mode that isn't supported
+    """
+    local_config = os.path.join(model_name, "1_Pooling", "config.json")
+    if os.path.isdir(model_name):
+        config_path = local_config if os.path.exists(local_config) else None
+    else:
+        from huggingface_hub import hf_hub_download
+        from huggingface_hub.utils import EntryNotFoundError
+        try:
+            config_path = hf_hub_download(model_name, "1_Pooling/config.json")
+        except EntryNotFoundError:
+            config_path = None
+    
+    if config_path is None:
+        # sentence-transformers wraps plain transformer models with mean pooling too
+        logger.warning(f"{model_name} has no pooling config; using mean pooling")
+        return "mean"
+    
+    with open(config_path, encoding="utf-8") as f:
+        config = json.load(f)
+    enabled = [flag for flag, value in config.items() if flag.startswith("pooling_mode_") and value]
+    if len(enabled) != 1 or enabled[0] not in _POOLING_MODES:
+        raise ValueError(
+            f"{model_name} uses pooling {enabled or 'none'}; the ONNX backend supports "
+            f"only {' and '.join(_POOLING_MODES.values())} pooling"
+        )
+    return _POOLING_MODES[enabled[0]]
+
 
 class EmbeddingGenerator:
     """Generates embeddings using sentence transformers"""
@@ -29,6 +77,9 @@ class EmbeddingGenerator:
         logger.info(f"Loading embedding model: {model_name}")
         
         try:
+            # Imported here so processes that never embed skip loading torch
+            from sentence_transformers import SentenceTransformer
+            
             self.model = SentenceTransformer(model_name)
             self.embedding_dim = self.model.get_sentence_embedding_dimension()
             logger.info(f"Model loaded successfully. Embedding dimension: {self.embedding_dim}")
@@ -36,16 +87,17 @@ class EmbeddingGenerator:
             logger.error(f"Error loading embedding model: {e}")
             raise
     
-    def encode_text(self, text: Union[str, List[str]], batch_size: int = 32) -> Union[List[float], List[List[float]]]:
+    def encode_text(self, text: Union[str, List[str]], batch_size: int = 32, as_numpy: bool = False) -> Union[List[float], List[List[float]]]:
         """
         Generate embeddings for text or list of texts
         
         Parameters:
             text: Single text string or list of text strings
             batch_size: Batch size for processing multiple texts
+            as_numpy: Return a float32 numpy array instead of Python lists
         
         Returns:
-            Embedding vector(s) as list or list of lists
+            Embedding vector(s) as list or list of lists (or numpy array)
         """
         try:
             # Handle single text
@@ -61,7 +113,7 @@ class EmbeddingGenerator:
                     show_progress_bar=len(text) > 100,
                     convert_to_numpy=True
                 )
-                return embeddings.tolist()
+                return embeddings if as_numpy else embeddings.tolist()
             
             else:
                 raise ValueError(f"Input must be string or list of strings, got {type(text)}")
@@ -102,16 +154,167 @@ class EmbeddingGenerator:
         return self.embedding_dim
 
 
+class ONNXEmbeddingGenerator(EmbeddingGenerator):
+    """Generates embeddings with an ONNX Runtime export of a CLS- or mean-pooling sentence transformer"""
+    
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        quantize: bool = True,
+        export_dir: str = "./onnx_models",
+        max_length: int = 256
+    ):
+        """
+        Initialize ONNX embedding generator
+        
+        Parameters:
+            model_name: Name of the sentence transformer model to export
+                       Default: all-MiniLM-L6-v2 (384-dim, fast on CPU)
+            quantize: Apply dynamic int8 quantization to the exported model
+            export_dir: Directory where exported ONNX models are kept
+            max_length: Maximum number of tokens per input
+        """
+        self.model_name = model_name
+        self.max_length = max_length
+        logger.info(f"Loading ONNX embedding model: {model_name}")
+        
+        try:
+            # Read before exporting, so an unsupported model fails fast
+            self.pooling = _pooling_mode(model_name)
+            
+            from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            from transformers import AutoTokenizer
+            
+            model_dir = os.path.join(export_dir, model_name.replace('/', '__'))
+            file_name = "model_quantized.onnx" if quantize else "model.onnx"
+            
+            # Export (and quantize) once; later starts load the saved graph
+            if not os.path.exists(os.path.join(model_dir, file_name)):
+                logger.info(f"Exporting {model_name} to ONNX at {model_dir}")
+                model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+                model.save_pretrained(model_dir)
+                AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+                
+                if quantize:
+                    quantizer = ORTQuantizer.from_pretrained(model)
+                    quantizer.quantize(
+                        save_dir=model_dir,
+                        quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+                    )
+            
+            self.model = ORTModelForFeatureExtraction.from_pretrained(
+                model_dir,
+                file_name=file_name,
+                provider="CPUExecutionProvider"
+            )
+            self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+            self.embedding_dim = self.model.config.hidden_size
+            logger.info(
+                f"ONNX model loaded successfully. Embedding dimension: {self.embedding_dim}, "
+                f"pooling: {self.pooling}"
+            )
+        except Exception as e:
+            logger.error(f"Error loading ONNX embedding model: {e}")
+            raise
+    
+    def _encode(self, texts: List[str], batch_size: int = 32):
+        """
+        Run texts through the ONNX model with the model's pooling and L2 normalization
+        
+        Parameters:
+            texts: List of text strings
+            batch_size: Batch size for processing
+        
+        Returns:
+            Embeddings as a float32 numpy array
+        """
+        import numpy as np
+        
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            
+            if self.pooling == "cls":
+                pooled = hidden[:, 0]
+            else:
+                # Mean pooling over non-padding tokens, as sentence-transformers does
+                mask = inputs["attention_mask"][..., None].astype(np.float32)
+                pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-9, None)
+            batches.append(pooled.astype(np.float32))
+        
+        if not batches:
+            return np.empty((0, self.embedding_dim), dtype=np.float32)
+        return np.vstack(batches)
+    
+    def encode_text(self, text: Union[str, List[str]], batch_size: int = 32, as_numpy: bool = False) -> Union[List[float], List[List[float]]]:
+        """
+        Generate embeddings for text or list of texts
+        
+        Parameters:
+            text: Single text string or list of text strings
+            batch_size: Batch size for processing multiple texts
+            as_numpy: Return a float32 numpy array instead of Python lists
+        
+        Returns:
+            Embedding vector(s) as list or list of lists (or numpy array)
+        """
+        try:
+            if isinstance(text, str):
+                return self._encode([text])[0].tolist()
+            elif isinstance(text, list):
+                embeddings = self._encode(text, batch_size=batch_size)
+                return embeddings if as_numpy else embeddings.tolist()
+            else:
+                raise ValueError(f"Input must be string or list of strings, got {type(text)}")
+        
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            raise
+    
+    def encode_query(self, query: str) -> List[float]:
+        """
+        Generate embedding for a query (adds instruction prefix for BGE models)
+        
+        Parameters:
+            query: Query text
+        
+        Returns:
+            Query embedding vector
+        """
+        try:
+            # Same instruction prefix as the sentence-transformers backend
+            if "bge" in self.model_name.lower():
+                query = f"Represent this sentence for searching relevant passages: {query}"
+            return self._encode([query])[0].tolist()
+        except Exception as e:
+            logger.error(f"Error generating query embedding: {e}")
+            raise
+
+
 # Global embedding generator instance (lazy loaded)
 _embedding_generator = None
+_embedding_generator_lock = threading.Lock()
 
 
-def get_embedding_generator(model_name: str = "BAAI/bge-large-en-v1.5") -> EmbeddingGenerator:
+def get_embedding_generator(
+    model_name: str = "BAAI/bge-large-en-v1.5",
+    backend: str = "sentence-transformers"
+) -> EmbeddingGenerator:
     """
     Get or create global embedding generator instance
     
     Parameters:
         model_name: Name of the model to use
+        backend: 'sentence-transformers' (PyTorch) or 'onnx' (ONNX Runtime)
     
     Returns:
         EmbeddingGenerator instance
@@ -119,6 +322,11 @@ def get_embedding_generator(model_name: str = "BAAI/bge-large-en-v1.5") -> Embed
     global _embedding_generator
     
     if _embedding_generator is None:
-        _embedding_generator = EmbeddingGenerator(model_name)
+        with _embedding_generator_lock:
+            if _embedding_generator is None:
+                if backend == "onnx":
+                    _embedding_generator = ONNXEmbeddingGenerator(model_name)
+                else:
+                    _embedding_generator = EmbeddingGenerator(model_name)
     
     return _embedding_generator
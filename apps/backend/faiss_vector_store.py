@@ -0,0 +1,770 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+FAISS Vector Store Module
+FAISS IVF-PQ alternative to the ChromaDB store, with chunk text and metadata kept in SQLite
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import closing
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+import faiss
+
+logger = logging.getLogger(__name__)
+
+# Below this many vectors an exhaustive 16-bit index is fast enough and
+# near-lossless; once reached, the store is retrained as IVF-PQ
+IVFPQ_TRAIN_THRESHOLD = 10000
+
+# IVF-PQ parameters: coarse clusters, clusters probed per query,
+# PQ sub-quantizers (upper bound; must divide the dimension) and bits per code
+IVF_NLIST = 256
+IVF_NPROBE = 16
+PQ_M = 32
+PQ_NBITS = 8
+
+
+def _pq_subquantizers(dimension: int, max_m: int = PQ_M) -> int:
+    """
+    Pick the number of PQ sub-quantizers for a dimension
+
+    Parameters:
+        dimension: Embedding dimension
+        max_m: Largest number of sub-quantizers to use
+
+    Returns:
+        Largest m <= max_m that divides the dimension
+    """
+    for m in range(min(max_m, dimension), 0, -1):
+        if dimension % m == 0:
+            return m
+    return 1
+
+
+def _flat_index(dimension: int):
+    """
+    Create the exhaustive-search index used until there is enough data for IVF-PQ
+
+    Parameters:
+        dimension: Embedding dimension
+
+    Returns:
+        ID-mapped scalar-quantizer index storing vectors as bfloat16
+        (float16 on FAISS builds older than 1.9, which lack bf16)
+    """
+    qtype = getattr(faiss.ScalarQuantizer, "QT_bf16", None)
+    if qtype is None:
+        logger.warning(
+            f"FAISS {faiss.__version__} has no bfloat16 scalar quantizer; storing vectors "
+            f"as float16 instead (install faiss-cpu>=1.9.0 for bfloat16)"
+        )
+        qtype = faiss.ScalarQuantizer.QT_fp16
+    return faiss.IndexIDMap2(
+        faiss.IndexScalarQuantizer(dimension, qtype, faiss.METRIC_INNER_PRODUCT)
+    )
+
+
+def _index_ids(index) -> np.ndarray:
+    """
+    List the ids stored in a flat or IVF-PQ index
+
+    Parameters:
+        index: Index built by _flat_index() or retrained as IVF-PQ
+
+    Returns:
+        int64 array of FAISS ids, in no particular order
+    """
+    if not isinstance(index, faiss.IndexIVF):
+        return faiss.vector_to_array(index.id_map)
+
+    invlists = index.invlists
+    parts = [
+        faiss.rev_swig_ptr(invlists.get_ids(l), invlists.list_size(l)).copy()
+        for l in range(index.nlist)
+        if invlists.list_size(l)
+    ]
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+class FaissVectorStore:
+    """Manages vector database operations using FAISS; drop-in replacement for VectorStore"""
+
+    def __init__(
+        self,
+        persist_directory: str = "./faiss_db",
+        use_gpu: bool = True,
+        auto_maintenance: bool = True
+    ):
+        """
+        Initialize FAISS vector store
+
+        Parameters:
+            persist_directory: Directory to persist the index and metadata database
+            use_gpu: Search a GPU copy of the IVF-PQ index when a GPU build of FAISS finds a device
+            auto_maintenance: Run index maintenance (IVF-PQ retraining and saving)
+                              in a background thread after writes; if False,
+                              call run_maintenance() explicitly
+        """
+        self.persist_directory = persist_directory
+        os.makedirs(persist_directory, exist_ok=True)
+
+        self.index_path = os.path.join(persist_directory, "academic_papers.index")
+        self.db_path = os.path.join(persist_directory, "academic_papers.sqlite3")
+
+        # FAISS indexes are not safe to search while being modified, so a
+        # published index is never modified: writers change a copy and swap
+        # self.index in one assignment, and searches read it without a lock.
+        # _write_lock serializes writers, including maintenance's final swap
+        self._write_lock = threading.RLock()
+        # Held while the index file is written, so reset() can't race a save
+        self._save_lock = threading.Lock()
+        # StandardGpuResources is not thread-safe, so GPU searches and
+        # updates to the GPU copy take turns
+        self._gpu_lock = threading.Lock()
+
+        # Every chunk's normalized vector is kept next to its text, so the
+        # index file is only a cache: it is saved in the background and
+        # reconciled with this table once per process
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS chunks (
+                    rowid INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT UNIQUE NOT NULL,
+                    paper_id TEXT,
+                    document TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    embedding BLOB NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_paper_id ON chunks(paper_id)")
+
+        # CPU-only FAISS builds have no get_num_gpus
+        self._gpu_resources = None
+        if use_gpu and getattr(faiss, "get_num_gpus", lambda: 0)() > 0:
+            self._gpu_resources = faiss.StandardGpuResources()
+            logger.info("FAISS GPU available; IVF-PQ searches will run on GPU 0")
+
+        # The index is created on first add, once the embedding dimension is known.
+        # _gpu_index is a search-only copy of it, rebuilt on the next search
+        # once _gpu_stale is set
+        self.index = None
+        self._gpu_index = None
+        self._gpu_stale = False
+        if os.path.exists(self.index_path):
+            self.index = faiss.read_index(self.index_path)
+            self._gpu_stale = True
+            logger.info(f"Loaded existing FAISS index with {self.index.ntotal} vectors")
+        else:
+            logger.info(f"Initialized new FAISS vector store at: {persist_directory}")
+
+        # Set when self.index has changes the index file lacks
+        self._dirty = False
+        # The index file may miss the last writes before a crash; reconciled once per process
+        self._synced = False
+
+        # At most one maintenance thread; writes while it runs ask for another pass
+        self.auto_maintenance = auto_maintenance
+        self._maintenance_lock = threading.Lock()
+        self._maintenance_thread = None
+        self._maintenance_pending = False
+
+        self._schedule_maintenance()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new metadata connection (one per operation, so it is safe across Flask threads)"""
+        return sqlite3.connect(self.db_path, timeout=5.0)
+
+    def _is_ivf(self) -> bool:
+        """Whether the index has been retrained as IVF-PQ"""
+        return isinstance(self.index, faiss.IndexIVF)
+
+    def _gpu_search_index(self):
+        """
+        Get the GPU copy of the IVF-PQ index, copying it over first if it is stale;
+        call with _gpu_lock held
+
+        Deletes and retraining only mark the copy stale, so a run of writes
+        costs one host-to-device copy, paid by the next search.
+
+        Returns:
+            GPU index, or None to search on CPU
+        """
+        if self._gpu_resources is None or not self._is_ivf():
+            return None
+
+        if self._gpu_stale:
+            self._gpu_stale = False
+            self._gpu_index = None
+            try:
+                self._gpu_index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, self.index)
+            except Exception as e:
+                logger.warning(f"Could not copy FAISS index to GPU, searching on CPU: {e}")
+        return self._gpu_index
+
+    def _gpu_add(self, vectors: np.ndarray, ids: np.ndarray) -> None:
+        """
+        Apply an add to the GPU copy as well, so it doesn't need copying again;
+        call with _gpu_lock held
+
+        Parameters:
+            vectors: Normalized vectors added to the CPU index
+            ids: Their FAISS ids
+        """
+        if self._gpu_index is None or self._gpu_stale:
+            return
+
+        try:
+            self._gpu_index.add_with_ids(vectors, ids)
+        except Exception as e:
+            logger.warning(f"Could not add to GPU copy of FAISS index, it will be recopied: {e}")
+            self._gpu_stale = True
+
+    def _publish(self, index, gpu_stale: bool = True) -> None:
+        """
+        Make a new version of the index visible to searches; call with _write_lock
+        and _gpu_lock held
+
+        Parameters:
+            index: Replacement index, which must not be modified afterwards
+            gpu_stale: Whether the GPU copy has to be recopied from it
+        """
+        self.index = index
+        self._dirty = True
+        if gpu_stale:
+            self._gpu_stale = True
+
+    def _fetch_vectors(self, rowids: np.ndarray) -> np.ndarray:
+        """
+        Read stored vectors from the metadata database
+
+        Parameters:
+            rowids: FAISS ids of the chunks
+
+        Returns:
+            float32 array with one row per id, in the same order
+        """
+        vectors = {}
+        with closing(self._connect()) as conn:
+            # Batched to stay under SQLite's limit on bound parameters
+            for start in range(0, len(rowids), 500):
+                batch = [int(rowid) for rowid in rowids[start:start + 500]]
+                placeholders = ",".join("?" * len(batch))
+                for rowid, embedding in conn.execute(
+                    f"SELECT rowid, embedding FROM chunks WHERE rowid IN ({placeholders})", batch
+                ):
+                    vectors[rowid] = np.frombuffer(embedding, dtype=np.float32)
+        return np.vstack([vectors[int(rowid)] for rowid in rowids])
+
+    def _sync_index(self) -> None:
+        """Add vectors the index file missed and drop deleted ones, so the index matches the metadata database"""
+        with self._write_lock:
+            with closing(self._connect()) as conn:
+                stored = np.fromiter(
+                    (row[0] for row in conn.execute("SELECT rowid FROM chunks")), dtype=np.int64
+                )
+            indexed = _index_ids(self.index) if self.index is not None else np.empty(0, dtype=np.int64)
+            missing = np.setdiff1d(stored, indexed)
+            stale = np.setdiff1d(indexed, stored)
+
+            if len(missing) or len(stale):
+                index = faiss.clone_index(self.index) if self.index is not None else None
+                if len(stale):
+                    index.remove_ids(stale)
+                if len(missing):
+                    vectors = self._fetch_vectors(missing)
+                    if index is None:
+                        index = _flat_index(vectors.shape[1])
+                    index.add_with_ids(vectors, missing)
+                with self._gpu_lock:
+                    self._publish(index)
+                logger.info(f"Synced FAISS index: {len(missing)} vectors added, {len(stale)} removed")
+
+            self._synced = True
+
+    def _save_index(self) -> bool:
+        """
+        Atomically write the index to disk if it changed since the last save
+
+        Returns:
+            True if the index was written
+        """
+        with self._save_lock:
+            with self._write_lock:
+                if not self._dirty:
+                    return False
+                index = self.index
+                self._dirty = False
+
+            # Published indexes are never modified, so writers can go on meanwhile
+            try:
+                tmp_path = self.index_path + ".tmp"
+                faiss.write_index(index, tmp_path)
+                os.replace(tmp_path, self.index_path)
+            except Exception:
+                self._dirty = True
+                raise
+        return True
+
+    def _maybe_train_ivfpq(self) -> bool:
+        """
+        Rebuild the flat index as IVF-PQ once it holds enough vectors to train on
+
+        Training runs on a snapshot without holding the write lock; writes made
+        meanwhile are applied to the new index before it replaces the old one.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        source = self.index
+        if source is None or isinstance(source, faiss.IndexIVF) or source.ntotal < IVFPQ_TRAIN_THRESHOLD:
+            return False
+
+        dimension = source.d
+        ids = faiss.vector_to_array(source.id_map)
+        vectors = source.index.reconstruct_n(0, source.ntotal)
+
+        quantizer = faiss.IndexFlatIP(dimension)
+        index = faiss.IndexIVFPQ(
+            quantizer, dimension, IVF_NLIST,
+            _pq_subquantizers(dimension), PQ_NBITS,
+            faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(vectors)
+        index.add_with_ids(vectors, ids)
+        index.nprobe = IVF_NPROBE
+
+        with self._write_lock:
+            current = self.index
+            if current is None or isinstance(current, faiss.IndexIVF):
+                logger.info("FAISS index was reset while training; discarding IVF-PQ index")
+                return False
+
+            if current is not source:
+                # Row ids are never reused, so set differences find every change
+                current_ids = faiss.vector_to_array(current.id_map)
+                removed = np.setdiff1d(ids, current_ids)
+                added = np.setdiff1d(current_ids, ids)
+                if len(removed):
+                    index.remove_ids(removed)
+                if len(added):
+                    index.add_with_ids(np.vstack([current.reconstruct(int(i)) for i in added]), added)
+
+            with self._gpu_lock:
+                self._publish(index)
+
+        logger.info(f"Retrained FAISS index as IVF-PQ over {index.ntotal} vectors")
+        return True
+
+    def run_maintenance(self) -> None:
+        """Reconcile the index with the metadata database, retrain it as IVF-PQ when due and save it"""
+        try:
+            if not self._synced:
+                self._sync_index()
+            self._maybe_train_ivfpq()
+            self._save_index()
+        except Exception as e:
+            logger.error(f"Error during vector store maintenance: {e}")
+
+    def _schedule_maintenance(self) -> None:
+        """Run maintenance in the background, coalescing requests made while it runs"""
+        if not self.auto_maintenance:
+            return
+
+        with self._maintenance_lock:
+            if self._maintenance_thread is not None:
+                self._maintenance_pending = True
+                return
+            self._maintenance_thread = threading.Thread(
+                target=self._maintenance_loop, name="faiss-maintenance", daemon=True
+            )
+            self._maintenance_thread.start()
+
+    def _maintenance_loop(self) -> None:
+        """Run maintenance until no further pass has been requested"""
+        while True:
+            self.run_maintenance()
+            with self._maintenance_lock:
+                if not self._maintenance_pending:
+                    self._maintenance_thread = None
+                    return
+                self._maintenance_pending = False
+
+    @staticmethod
+    def _where_paper_ids(where: Optional[Dict[str, Any]]) -> Optional[List[str]]:
+        """
+        Translate a Chroma-style paper_id filter into a list of paper IDs
+
+        Parameters:
+            where: None, {"paper_id": id} or {"paper_id": {"$in": [ids]}}
+
+        Returns:
+            List of paper IDs, or None for no filter
+        """
+        if not where:
+            return None
+
+        if set(where) != {"paper_id"}:
+            raise ValueError(f"Unsupported filter for FAISS vector store: {where}")
+
+        condition = where["paper_id"]
+        if isinstance(condition, dict):
+            if set(condition) != {"$in"}:
+                raise ValueError(f"Unsupported filter for FAISS vector store: {where}")
+            return list(condition["$in"])
+        return [condition]
+
+    def _rowids_for_papers(self, paper_ids: List[str]) -> List[int]:
+        """
+        Look up the FAISS ids of every chunk belonging to the given papers
+
+        Parameters:
+            paper_ids: Paper IDs to look up
+
+        Returns:
+            List of chunk row IDs
+        """
+        placeholders = ",".join("?" * len(paper_ids))
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT rowid FROM chunks WHERE paper_id IN ({placeholders})", paper_ids
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def add_documents(
+        self,
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str]
+    ) -> bool:
+        """
+        Add documents with embeddings to the vector store
+
+        Parameters:
+            documents: List of document text chunks
+            embeddings: Embedding vectors, as a list of lists or a 2D numpy array
+            metadatas: List of metadata dictionaries
+            ids: List of unique IDs for each chunk
+
+        Returns:
+            True if successful
+        """
+        try:
+            vectors = np.asarray(embeddings, dtype=np.float32)
+            # Inner product over unit vectors is cosine similarity
+            faiss.normalize_L2(vectors)
+
+            with self._write_lock, closing(self._connect()) as conn, conn:
+                rowids = []
+                keep = []
+                for i, (doc, metadata, chunk_id) in enumerate(zip(documents, metadatas, ids)):
+                    cursor = conn.execute(
+                        """INSERT OR IGNORE INTO chunks (id, paper_id, document, metadata, embedding)
+                        VALUES (?, ?, ?, ?, ?)""",
+                        (chunk_id, metadata.get('paper_id'), doc, json.dumps(metadata), vectors[i].tobytes())
+                    )
+                    # Chunks already stored under the same ID are left untouched
+                    if cursor.rowcount:
+                        rowids.append(cursor.lastrowid)
+                        keep.append(i)
+
+                if rowids:
+                    # Searches may be reading the published index, so add to a
+                    # copy; a failure here rolls back the metadata inserts above
+                    if self.index is None:
+                        index = _flat_index(vectors.shape[1])
+                    else:
+                        index = faiss.clone_index(self.index)
+                    new_vectors = vectors[keep]
+                    new_ids = np.asarray(rowids, dtype=np.int64)
+                    index.add_with_ids(new_vectors, new_ids)
+
+                    with self._gpu_lock:
+                        self._publish(index, gpu_stale=False)
+                        self._gpu_add(new_vectors, new_ids)
+
+            logger.info(f"Added {len(rowids)} documents to vector store")
+            # Retraining at the threshold and saving happen off the request path
+            if rowids:
+                self._schedule_maintenance()
+            return True
+        except Exception as e:
+            logger.error(f"Error adding documents to vector store: {e}")
+            return False
+
+    def query(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Query the vector store for similar documents
+
+        Parameters:
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+            where: Optional paper_id filter, in ChromaDB syntax
+
+        Returns:
+            Dictionary with query results including documents, metadatas, distances
+        """
+        return self.query_batch([query_embedding], n_results=n_results, where=where)[0]
+
+    def query_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the vector store for several embeddings in one search call
+
+        Parameters:
+            query_embeddings: Query embedding vectors
+            n_results: Number of results to return per query
+            where: Optional paper_id filter, in ChromaDB syntax, shared by every query
+
+        Returns:
+            One result dictionary per query embedding, in the same order
+        """
+        def empty():
+            return {
+                'documents': [],
+                'metadatas': [],
+                'distances': [],
+                'ids': []
+            }
+
+        if not query_embeddings:
+            return []
+
+        try:
+            query_vectors = np.asarray(query_embeddings, dtype=np.float32)
+            faiss.normalize_L2(query_vectors)
+            paper_ids = self._where_paper_ids(where)
+
+            # Published indexes are never modified, so this one can be searched
+            # without a lock, concurrently with other searches and with writes
+            index = self.index
+            if index is None or index.ntotal == 0:
+                return [empty() for _ in query_embeddings]
+
+            params = None
+            if paper_ids is not None:
+                rowids = self._rowids_for_papers(paper_ids)
+                if not rowids:
+                    return [empty() for _ in query_embeddings]
+
+                selector = faiss.IDSelectorBatch(np.asarray(rowids, dtype=np.int64))
+                if isinstance(index, faiss.IndexIVF):
+                    params = faiss.SearchParametersIVF(sel=selector, nprobe=IVF_NPROBE)
+                else:
+                    params = faiss.SearchParameters(sel=selector)
+
+            # ID selectors only work on CPU, so filtered searches stay there
+            labels = None
+            if params is None and self._gpu_resources is not None:
+                with self._gpu_lock:
+                    gpu_index = self._gpu_search_index()
+                    if gpu_index is not None:
+                        similarities, labels = gpu_index.search(query_vectors, n_results)
+            if labels is None:
+                similarities, labels = index.search(query_vectors, n_results, params=params)
+
+            # Fetch text and metadata for every hit of every query at once
+            hit_labels = sorted({int(label) for label in labels.ravel() if label != -1})
+            rows = {}
+            if hit_labels:
+                placeholders = ",".join("?" * len(hit_labels))
+                with closing(self._connect()) as conn:
+                    rows = {
+                        row[0]: row[1:]
+                        for row in conn.execute(
+                            f"SELECT rowid, id, document, metadata FROM chunks WHERE rowid IN ({placeholders})",
+                            hit_labels
+                        )
+                    }
+
+            batch_results = []
+            for query_labels, query_similarities in zip(labels, similarities):
+                results = empty()
+                for label, similarity in zip(query_labels, query_similarities):
+                    label = int(label)
+                    if label not in rows:
+                        continue
+                    chunk_id, document, metadata = rows[label]
+                    results['documents'].append(document)
+                    results['metadatas'].append(json.loads(metadata))
+                    # Report cosine distance, as the Chroma collection does
+                    results['distances'].append(1 - float(similarity))
+                    results['ids'].append(chunk_id)
+                batch_results.append(results)
+
+            logger.info(
+                f"Query of {len(query_embeddings)} embeddings returned "
+                f"{sum(len(r['documents']) for r in batch_results)} results"
+            )
+            return batch_results
+        except Exception as e:
+            logger.error(f"Error querying vector store: {e}")
+            return [empty() for _ in query_embeddings]
+
+    def get_paper_chunks(self, paper_id: str) -> Dict[str, Any]:
+        """
+        Get all chunks for a specific paper
+
+        Parameters:
+            paper_id: Paper ID to retrieve chunks for
+
+        Returns:
+            Dictionary with all chunks and metadata for the paper
+        """
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT id, document, metadata FROM chunks WHERE paper_id = ? ORDER BY rowid",
+                    (paper_id,)
+                ).fetchall()
+
+            logger.info(f"Retrieved {len(rows)} chunks for paper {paper_id}")
+            return {
+                'documents': [row[1] for row in rows],
+                'metadatas': [json.loads(row[2]) for row in rows],
+                'ids': [row[0] for row in rows]
+            }
+        except Exception as e:
+            logger.error(f"Error retrieving paper chunks: {e}")
+            return {'documents': [], 'metadatas': [], 'ids': []}
+
+    def list_papers(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        List papers in the vector store, in upload order
+
+        Parameters:
+            limit: Maximum number of papers to return (None for all)
+            offset: Number of papers to skip
+
+        Returns:
+            List of unique papers with their metadata
+        """
+        try:
+            # Paper-level fields are repeated on every chunk; take the first one's
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    """SELECT metadata FROM chunks WHERE rowid IN (
+                        SELECT MIN(rowid) FROM chunks WHERE paper_id IS NOT NULL GROUP BY paper_id
+                    ) ORDER BY rowid LIMIT ? OFFSET ?""",
+                    (limit if limit is not None else -1, offset)
+                ).fetchall()
+
+            papers = []
+            for (metadata,) in rows:
+                metadata = json.loads(metadata)
+                papers.append({
+                    'paper_id': metadata.get('paper_id'),
+                    'title': metadata.get('title', 'Unknown'),
+                    'authors': metadata.get('authors', ''),
+                    'year': metadata.get('year', ''),
+                    'upload_date': metadata.get('upload_date', '')
+                })
+
+            return papers
+        except Exception as e:
+            logger.error(f"Error listing papers: {e}")
+            return []
+
+    def delete_paper(self, paper_id: str) -> bool:
+        """
+        Delete all chunks for a specific paper
+
+        Parameters:
+            paper_id: Paper ID to delete
+
+        Returns:
+            True if successful
+        """
+        try:
+            with self._write_lock:
+                rowids = self._rowids_for_papers([paper_id])
+                if not rowids:
+                    logger.warning(f"No chunks found for paper {paper_id}")
+                    return False
+
+                with closing(self._connect()) as conn, conn:
+                    conn.execute("DELETE FROM chunks WHERE paper_id = ?", (paper_id,))
+
+                if self.index is not None:
+                    index = faiss.clone_index(self.index)
+                    index.remove_ids(np.asarray(rowids, dtype=np.int64))
+                    # GPU indexes can't remove ids; recopied on the next search
+                    with self._gpu_lock:
+                        self._publish(index)
+
+            logger.info(f"Deleted {len(rowids)} chunks for paper {paper_id}")
+            self._schedule_maintenance()
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting paper: {e}")
+            return False
+
+    def count_documents(self) -> int:
+        """
+        Count total documents in the vector store
+
+        Returns:
+            Number of documents
+        """
+        try:
+            with closing(self._connect()) as conn:
+                return conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error counting documents: {e}")
+            return 0
+
+    def count_papers(self) -> int:
+        """
+        Count distinct papers in the vector store
+
+        Returns:
+            Number of papers
+        """
+        try:
+            with closing(self._connect()) as conn:
+                return conn.execute("SELECT COUNT(DISTINCT paper_id) FROM chunks").fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error counting papers: {e}")
+            return 0
+
+    def reset(self) -> bool:
+        """
+        Reset the entire vector store (use with caution!)
+
+        Returns:
+            True if successful
+        """
+        try:
+            with self._save_lock, self._write_lock:
+                with self._gpu_lock:
+                    self.index = None
+                    self._gpu_index = None
+                    self._gpu_stale = False
+                self._dirty = False
+                if os.path.exists(self.index_path):
+                    os.remove(self.index_path)
+
+                with closing(self._connect()) as conn, conn:
+                    conn.execute("DELETE FROM chunks")
+
+            logger.warning("Vector store has been reset!")
+            return True
+        except Exception as e:
+            logger.error(f"Error resetting vector store: {e}")
+            return False
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gunicorn configuration for the ScholarSense backend
+
+Runs a single worker process with a pool of threads. Every worker builds its
+own RAG engine (embedding model, Chroma client, HNSW graph), so extra worker
+processes multiply memory use and put several writers on one Chroma
+directory. The engine is shared safely between the threads of one process.
+"""
+
+import os
+import threading
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+workers = 1
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+worker_class = 'gthread'
+
+# GROBID extraction and embedding of large papers can take minutes
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 300))
+
+
+def post_worker_init(worker):
+    """Load models and indexes in the background so the worker starts serving immediately"""
+    from app import warm_up_rag_engine
+
+    threading.Thread(target=warm_up_rag_engine, name="rag-warmup", daemon=True).start()
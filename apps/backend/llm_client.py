@@ -7,12 +7,26 @@ Integrates with Google Gemini API for generating citation-grounded answers
 """
 
 import os
+import re
 import logging
+import threading
 from typing import List, Dict, Any
-import google.generativeai as genai
 
 logger = logging.getLogger(__name__)
 
+# Separator between formatted contexts in the RAG prompt
+CONTEXT_SEPARATOR = "\n"
+
+# Stance labels requested by the detect_stance prompt, and the marker the
+# model usually puts before its classification: "Stance:" or "Stance
+# classification:", possibly in markdown bold. The colon keeps words like
+# "instance" or a passing mention of the stance from counting as the marker
+_STANCE_RE = re.compile(r"\b(supportive|critical|neutral|uncertain)\b", re.IGNORECASE)
+_STANCE_MARKER_RE = re.compile(r"\bstance(?:\s+classification)?\s*\**\s*:", re.IGNORECASE)
+
+# Only the head of the response is scanned; the label comes first
+STANCE_SCAN_CHARS = 500
+
 
 class LLMClient:
     """Client for Google Gemini API"""
@@ -32,6 +46,9 @@ class LLMClient:
         
         self.model_name = model_name
         
+        # Imported lazily: the Gemini SDK pulls in grpc and protobuf
+        import google.generativeai as genai
+        
         # Configure the API
         genai.configure(api_key=self.api_key)
         
@@ -60,26 +77,17 @@ class LLMClient:
             Dictionary with answer, citations, and metadata
         """
         try:
-            # Build context string with citations
-            context_parts = []
-            for i, ctx in enumerate(contexts, 1):
-                metadata = ctx.get('metadata', {})
-                text = ctx.get('text', '')
-                
-                paper_title = metadata.get('title', 'Unknown')
-                section = metadata.get('section', 'Unknown')
-                page = metadata.get('page', 'N/A')
-                
-                context_parts.append(
-                    f"[{i}] Source: {paper_title}, Section: {section}, Page: {page}\n{text}\n"
-                )
-            
-            context_str = "\n".join(context_parts)
+            # Build context string with citations in a single join
+            context_str = CONTEXT_SEPARATOR.join(
+                self._format_context(i, ctx) for i, ctx in enumerate(contexts, 1)
+            )
             
             # Build prompt
             prompt = self._build_rag_prompt(query, context_str)
             
             # Generate response
+            import google.generativeai as genai
+            
             generation_config = genai.types.GenerationConfig(
                 temperature=temperature,
                 max_output_tokens=max_tokens,
@@ -111,6 +119,25 @@ class LLMClient:
                 'error': str(e)
             }
     
+    @staticmethod
+    def _format_context(index: int, ctx: Dict[str, Any]) -> str:
+        """
+        Format a single retrieved context with its citation header
+        
+        Parameters:
+            index: Citation number for the context
+            ctx: Context chunk with text and metadata
+        
+        Returns:
+            Formatted context string
+        """
+        metadata = ctx.get('metadata', {})
+        return (
+            f"[{index}] Source: {metadata.get('title', 'Unknown')}, "
+            f"Section: {metadata.get('section', 'Unknown')}, "
+            f"Page: {metadata.get('page', 'N/A')}\n{ctx.get('text', '')}\n"
+        )
+    
     def _build_rag_prompt(self, query: str, contexts: str) -> str:
         """
         Build prompt for RAG-based question answering
@@ -190,13 +217,11 @@ Answer:"""
                 comparison_aspects = ["methodology", "results", "conclusions", "limitations"]
             
             # Build comparison prompt
-            papers_summary = []
-            for i, paper in enumerate(papers_data, 1):
-                title = paper.get('title', f'Paper {i}')
-                abstract = paper.get('abstract', 'No abstract available')
-                papers_summary.append(f"Paper {i}: {title}\nAbstract: {abstract}\n")
-            
-            papers_str = "\n".join(papers_summary)
+            papers_str = "\n".join(
+                f"Paper {i}: {paper.get('title', f'Paper {i}')}\n"
+                f"Abstract: {paper.get('abstract', 'No abstract available')}\n"
+                for i, paper in enumerate(papers_data, 1)
+            )
             aspects_str = ", ".join(comparison_aspects)
             
             prompt = f"""You are comparing multiple academic papers. Analyze and compare the following papers across these aspects: {aspects_str}.
@@ -213,6 +238,8 @@ Provide a structured comparison highlighting:
 
 Comparison:"""
             
+            import google.generativeai as genai
+            
             generation_config = genai.types.GenerationConfig(
                 temperature=temperature,
                 max_output_tokens=2048,
@@ -271,10 +298,10 @@ Analysis:"""
             
             response = self.model.generate_content(prompt)
             
-            # Parse response (simplified - could use more structured parsing)
             result_text = response.text
             
             return {
+                'stance': self._parse_stance(result_text),
                 'stance_analysis': result_text,
                 'text': text[:200] + '...' if len(text) > 200 else text
             }
@@ -286,9 +313,38 @@ Analysis:"""
                 'error': str(e)
             }
 
+    
+    @staticmethod
+    def _parse_stance(analysis_text: str) -> str:
+        """
+        Extract the stance label from a detect_stance response
+        
+        Scans the head of the response once, preferring the first label that
+        follows a "Stance:" marker and otherwise the earliest label mentioned.
+        
+        Parameters:
+            analysis_text: Raw model response
+        
+        Returns:
+            Lowercase stance label, or 'unknown' if none was found
+        """
+        head = analysis_text[:STANCE_SCAN_CHARS]
+        marker = _STANCE_MARKER_RE.search(head)
+        marker_end = marker.end() if marker else 0
+        
+        earliest = None
+        for match in _STANCE_RE.finditer(head):
+            if match.start() >= marker_end:
+                return match.group(1).lower()
+            if earliest is None:
+                earliest = match.group(1).lower()
+        
+        return earliest or 'unknown'
+
 
 # Global LLM client instance (lazy loaded)
 _llm_client = None
+_llm_client_lock = threading.Lock()
 
 
 def get_llm_client(api_key: str = None, model_name: str = "gemini-pro") -> LLMClient:
@@ -305,6 +361,8 @@ def get_llm_client(api_key: str = None, model_name: str = "gemini-pro") -> LLMCl
     global _llm_client
     
     if _llm_client is None:
-        _llm_client = LLMClient(api_key, model_name)
+        with _llm_client_lock:
+            if _llm_client is None:
+                _llm_client = LLMClient(api_key, model_name)
     
     return _llm_client
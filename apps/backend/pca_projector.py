@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+PCA Projector Module
+Projects embeddings onto their top principal components to shrink stored vectors
+"""
+
+import os
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Chunks needed before the projection is fitted
+PCA_MIN_TRAIN_SIZE = 10000
+
+# Output dimension; keeps roughly 95% of the variance of sentence-transformer embeddings
+PCA_COMPONENTS = 128
+
+
+class PCAProjector:
+    """Linear projection x -> (x - mean) @ components.T, fitted once and persisted"""
+
+    def __init__(self, path: str, n_components: int = PCA_COMPONENTS):
+        """
+        Initialize PCA projector, loading a previously fitted one if present
+
+        Parameters:
+            path: Path of the .npz file holding the fitted projection
+            n_components: Output dimension
+        """
+        self.path = path
+        self.n_components = n_components
+        self.mean = None
+        self.components = None
+
+        if os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    self.mean = data["mean"]
+                    self.components = data["components"]
+                self.n_components = len(self.components)
+                logger.info(f"Loaded PCA projection to {self.n_components} dimensions")
+            except Exception as e:
+                logger.warning(f"Could not load PCA projection: {e}")
+                self.mean = self.components = None
+
+    @property
+    def is_fitted(self) -> bool:
+        """Whether a projection has been fitted"""
+        return self.components is not None
+
+    def fit(self, vectors) -> bool:
+        """
+        Fit the projection in memory (call save() to persist it)
+
+        Parameters:
+            vectors: 2D array-like of embeddings
+
+        Returns:
+            True if the projection was fitted
+        """
+        x = np.asarray(vectors, dtype=np.float32)
+        if len(x) < max(PCA_MIN_TRAIN_SIZE, self.n_components) or x.shape[1] <= self.n_components:
+            logger.warning(f"Not fitting PCA: {x.shape[0]} vectors of dimension {x.shape[1] if x.ndim == 2 else 0}")
+            return False
+
+        # Imported lazily: scikit-learn is slow to import and only needed here
+        from sklearn.decomposition import IncrementalPCA
+
+        pca = IncrementalPCA(n_components=self.n_components, batch_size=max(4096, self.n_components))
+        pca.fit(x)
+
+        self.mean = pca.mean_.astype(np.float32)
+        self.components = pca.components_.astype(np.float32)
+        logger.info(
+            f"Fitted PCA {x.shape[1]} -> {self.n_components} dimensions, "
+            f"retaining {pca.explained_variance_ratio_.sum():.1%} of variance"
+        )
+        return True
+
+    def transform(self, vectors) -> np.ndarray:
+        """
+        Project vectors onto the fitted components
+
+        Parameters:
+            vectors: 2D array-like of embeddings
+
+        Returns:
+            float32 array of shape (N, n_components)
+        """
+        return (np.asarray(vectors, dtype=np.float32) - self.mean) @ self.components.T
+
+    def save(self) -> None:
+        """Persist the fitted projection"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        np.savez(self.path, mean=self.mean, components=self.components)
+
+    def reset(self) -> None:
+        """Drop the fitted projection"""
+        self.mean = self.components = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
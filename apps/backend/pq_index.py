@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+PQ Index Module
+In-memory product-quantization tier for approximate nearest-neighbour search
+"""
+
+import os
+import logging
+from typing import List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Optional dependency; search falls back to NumPy fancy indexing
+    njit = None
+
+# Vectors needed before a codebook is trained; each of the 256 centroids
+# per subspace should see a few dozen training points
+PQ_MIN_TRAIN_SIZE = 10000
+
+# Cap on the training sample, so retraining a large store stays quick
+PQ_MAX_TRAIN_SAMPLE = 65536
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, boundscheck=False, cache=True)
+    def _pq_scan(codes, lut, out):
+        """Sum each code's LUT entries: out[i] = sum_m lut[m, codes[i, m]]"""
+        n, m_count = codes.shape
+        for i in prange(n):
+            total = 0.0
+            for m in range(m_count):
+                total += lut[m, codes[i, m]]
+            out[i] = total
+else:
+    _pq_scan = None
+
+
+class PQIndex:
+    """Product-quantized codes for every stored chunk, searched with asymmetric distance computation"""
+
+    def __init__(self, index_directory: str, n_subvectors: int = 16, n_centroids: int = 256):
+        """
+        Initialize PQ index, loading a previously trained one if present
+
+        Parameters:
+            index_directory: Directory to persist centroids and codes
+            n_subvectors: Number of subspaces (M); must divide the embedding dimension
+            n_centroids: Centroids per subspace (K); at most 256 so codes fit in uint8
+        """
+        self.index_directory = index_directory
+        self.n_subvectors = n_subvectors
+        self.n_centroids = n_centroids
+
+        # Centroids, IDs and codes share one file, so a save is all-or-nothing
+        self._path = os.path.join(index_directory, "pq_index.npz")
+
+        # float32[M, K, dim/M], or None until trained
+        self.centroids = None
+        # (ids, codes) swapped as one tuple so concurrent readers never see
+        # ids and codes from different versions
+        self._table = (np.empty(0, dtype=str), np.empty((0, n_subvectors), dtype=np.uint8))
+        # Set by every change; save() is left to the caller, off the write path
+        self._dirty = False
+
+        if os.path.exists(self._path):
+            try:
+                with np.load(self._path) as data:
+                    centroids, ids, codes = data["centroids"], data["ids"], data["codes"]
+                if len(ids) != len(codes) or codes.shape[1] != n_subvectors:
+                    raise ValueError(f"{len(ids)} ids for codes of shape {codes.shape}")
+                self.centroids = centroids
+                self._table = (ids, codes)
+                logger.info(f"Loaded PQ index with {len(self)} codes")
+            except Exception as e:
+                logger.warning(f"Could not load PQ index, it will be retrained: {e}")
+
+    def __len__(self) -> int:
+        return len(self._table[0])
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether a codebook has been trained"""
+        return self.centroids is not None
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Chunk IDs that currently have codes"""
+        return self._table[0]
+
+    def _prepare(self, vectors) -> np.ndarray:
+        """
+        Convert vectors to unit-length float32 subspace blocks
+
+        Parameters:
+            vectors: 2D array-like of embeddings
+
+        Returns:
+            float32 array of shape (N, M, dim/M)
+        """
+        x = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(x, axis=1, keepdims=True)
+        x = x / np.maximum(norms, 1e-12)
+        return x.reshape(len(x), self.n_subvectors, -1)
+
+    def train(self, ids: List[str], vectors) -> bool:
+        """
+        Train the per-subspace codebooks and encode the given vectors
+
+        Parameters:
+            ids: Chunk IDs for the vectors
+            vectors: 2D array-like of embeddings
+
+        Returns:
+            True if the index was trained
+        """
+        dimension = np.shape(vectors)[1] if len(vectors) else 0
+        if len(vectors) < max(PQ_MIN_TRAIN_SIZE, self.n_centroids) or dimension % self.n_subvectors:
+            logger.warning(
+                f"Not training PQ index: {len(vectors)} vectors of dimension {dimension} "
+                f"(need {PQ_MIN_TRAIN_SIZE}, divisible by {self.n_subvectors})"
+            )
+            return False
+
+        # Imported lazily: scikit-learn is slow to import and only needed here
+        from sklearn.cluster import KMeans
+
+        blocks = self._prepare(vectors)
+        sample = blocks
+        if len(blocks) > PQ_MAX_TRAIN_SAMPLE:
+            rng = np.random.default_rng(0)
+            sample = blocks[rng.choice(len(blocks), PQ_MAX_TRAIN_SAMPLE, replace=False)]
+
+        centroids = np.empty(
+            (self.n_subvectors, self.n_centroids, blocks.shape[2]), dtype=np.float32
+        )
+        for m in range(self.n_subvectors):
+            kmeans = KMeans(n_clusters=self.n_centroids, n_init=1, max_iter=25, random_state=0)
+            kmeans.fit(sample[:, m, :])
+            centroids[m] = kmeans.cluster_centers_
+
+        self.centroids = centroids
+        self._table = (np.asarray(ids, dtype=str), self._encode_blocks(blocks))
+        self._dirty = True
+        logger.info(f"Trained PQ index over {len(self)} vectors")
+        return True
+
+    def _encode_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Assign each subvector to its nearest centroid
+
+        Parameters:
+            blocks: float32 array of shape (N, M, dim/M)
+
+        Returns:
+            uint8 codes of shape (N, M)
+        """
+        codes = np.empty((len(blocks), self.n_subvectors), dtype=np.uint8)
+        for m in range(self.n_subvectors):
+            # ||x - c||^2 up to the constant ||x||^2, for every (vector, centroid) pair
+            c = self.centroids[m]
+            dists = (c * c).sum(axis=1) - 2 * blocks[:, m, :] @ c.T
+            codes[:, m] = dists.argmin(axis=1)
+        return codes
+
+    def add(self, ids: List[str], vectors) -> None:
+        """
+        Encode and add vectors, replacing any existing codes with the same IDs
+
+        Parameters:
+            ids: Chunk IDs for the vectors
+            vectors: 2D array-like of embeddings
+        """
+        if not self.is_trained or not len(ids):
+            return
+
+        new_ids = np.asarray(ids, dtype=str)
+        new_codes = self._encode_blocks(self._prepare(vectors))
+
+        old_ids, old_codes = self._table
+        keep = ~np.isin(old_ids, new_ids)
+        self._table = (
+            np.concatenate([old_ids[keep], new_ids]),
+            np.concatenate([old_codes[keep], new_codes])
+        )
+        self._dirty = True
+
+    def remove(self, ids: List[str]) -> None:
+        """
+        Remove the codes for the given IDs
+
+        Parameters:
+            ids: Chunk IDs to remove
+        """
+        if not self.is_trained or not len(ids):
+            return
+
+        old_ids, old_codes = self._table
+        keep = ~np.isin(old_ids, np.asarray(ids, dtype=str))
+        self._table = (old_ids[keep], old_codes[keep])
+        self._dirty = True
+
+    def search(self, query_embedding: List[float], n_results: int = 5) -> Tuple[List[str], List[float]]:
+        """
+        Find approximate nearest neighbours with a precomputed distance table
+
+        Parameters:
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+
+        Returns:
+            Tuple of (chunk IDs, approximate cosine distances), nearest first
+        """
+        ids, codes = self._table
+        if not self.is_trained or not len(ids):
+            return [], []
+
+        q = self._prepare([query_embedding])[0]
+        # LUT[m, k] = ||q_m - c_{m,k}||^2
+        lut = ((self.centroids - q[:, None, :]) ** 2).sum(axis=2)
+
+        if _pq_scan is not None:
+            # One fused pass over the codes instead of materializing an (N, M) gather
+            scores = np.empty(len(codes), dtype=np.float32)
+            _pq_scan(np.ascontiguousarray(codes), np.ascontiguousarray(lut, dtype=np.float32), scores)
+        else:
+            scores = lut[np.arange(self.n_subvectors), codes].sum(axis=1)
+
+        k = min(n_results, len(scores))
+        if k < 1:
+            return [], []
+        top = np.argpartition(scores, k - 1)[:k]
+        top = top[np.argsort(scores[top])]
+
+        # Vectors are unit length, so ||q - x||^2 / 2 = 1 - cos(q, x)
+        return ids[top].tolist(), (scores[top] / 2).tolist()
+
+    def reset(self) -> None:
+        """Drop the codebook and all codes"""
+        self.centroids = None
+        self._table = (np.empty(0, dtype=str), np.empty((0, self.n_subvectors), dtype=np.uint8))
+        self._dirty = False
+        if os.path.exists(self._path):
+            os.remove(self._path)
+
+    def save(self) -> None:
+        """Persist centroids, codes and IDs, replacing the previous file atomically"""
+        if not self.is_trained:
+            return
+
+        # Cleared first, so a change made while writing marks the index dirty again
+        self._dirty = False
+        ids, codes = self._table
+        os.makedirs(self.index_directory, exist_ok=True)
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, centroids=self.centroids, ids=ids, codes=codes)
+        os.replace(tmp_path, self._path)
+
+    def flush(self) -> bool:
+        """
+        Persist the index if it changed since the last save
+
+        Returns:
+            True if the index was written
+        """
+        if not self._dirty:
+            return False
+        self.save()
+        return True
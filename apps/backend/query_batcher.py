@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Query Batcher Module
+Coalesces concurrent vector store queries into batched searches
+"""
+
+import json
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Longest a caller waits for its batch, so a stuck search can't hang request threads
+QUERY_TIMEOUT_SECONDS = 60
+
+
+class QueryBatcher:
+    """Groups queries arriving within a short window into one query_batch call"""
+
+    def __init__(self, vector_store, window_ms: float = 5.0, max_batch_size: int = 32):
+        """
+        Initialize query batcher and start its flush thread
+
+        Parameters:
+            vector_store: Vector store providing query_batch
+            window_ms: How long to wait for more queries after the first arrives
+            max_batch_size: Flush as soon as this many queries are waiting
+        """
+        self.vector_store = vector_store
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="query-batcher", daemon=True)
+        self._thread.start()
+
+        logger.info(f"Query batcher started (window={window_ms}ms, max_batch_size={max_batch_size})")
+
+    def query(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue a query and wait for its batch to be searched
+
+        Parameters:
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+            where: Optional metadata filter
+
+        Returns:
+            Dictionary with query results including documents, metadatas, distances
+
+        Raises:
+            concurrent.futures.TimeoutError: If the batch isn't searched within QUERY_TIMEOUT_SECONDS
+        """
+        future = Future()
+        self._queue.put((query_embedding, n_results, where, future))
+        return future.result(timeout=QUERY_TIMEOUT_SECONDS)
+
+    def _run(self) -> None:
+        """Collect queued queries into batches and flush them, forever"""
+        while True:
+            batch = [self._queue.get()]
+            try:
+                deadline = time.monotonic() + self.window_seconds
+
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                self._flush(batch)
+            except Exception as e:
+                # This is the only flush thread; if it died, every later query would hang
+                logger.error(f"Error in query batcher: {e}")
+                self._fail(batch, e)
+
+    @staticmethod
+    def _fail(items: List[tuple], error: Exception) -> None:
+        """
+        Fail every query in a list that hasn't been answered yet
+
+        Parameters:
+            items: List of (embedding, n_results, where, future) tuples
+            error: Exception to raise in the waiting callers
+        """
+        for item in items:
+            if not item[3].done():
+                item[3].set_exception(error)
+
+    def _flush(self, batch: List[tuple]) -> None:
+        """
+        Search a batch, one query_batch call per distinct (n_results, where)
+
+        Parameters:
+            batch: List of (embedding, n_results, where, future) tuples
+        """
+        groups = {}
+        for item in batch:
+            try:
+                key = (item[1], json.dumps(item[2], sort_keys=True))
+            except Exception as e:
+                # e.g. a filter that can't be serialized; fails this query only
+                logger.error(f"Error grouping batched query: {e}")
+                self._fail([item], e)
+                continue
+            groups.setdefault(key, []).append(item)
+
+        for items in groups.values():
+            try:
+                results = self.vector_store.query_batch(
+                    [item[0] for item in items],
+                    n_results=items[0][1],
+                    where=items[0][2]
+                )
+                for item, result in zip(items, results):
+                    item[3].set_result(result)
+            except Exception as e:
+                logger.error(f"Error running batched query: {e}")
+                self._fail(items, e)
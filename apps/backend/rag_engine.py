@@ -9,15 +9,61 @@ Orchestrates the RAG pipeline: chunking, embedding, storage, retrieval, and answ
 import os
 import logging
 import hashlib
+import threading
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from vector_store import VectorStore
 from embeddings import get_embedding_generator
 from llm_client import get_llm_client
+from result_cache import ResultCache
+from query_batcher import QueryBatcher
+from memory_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Query embeddings kept in memory, keyed by query text
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+
+class StagingBuffer:
+    """Chunks staged from one or more papers, embedded and stored together by RAGEngine.flush()"""
+    
+    def __init__(self):
+        self.documents = []
+        self.ids = []
+        self.metadatas = []
+        self.papers = []
+    
+    def __len__(self) -> int:
+        return len(self.documents)
+    
+    def add_paper(self, result: Dict[str, Any], documents: List[str], ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """
+        Stage one paper's chunks
+        
+        Parameters:
+            result: Ingestion result reported for the paper once flushed
+            documents: Chunk texts
+            ids: Chunk IDs
+            metadatas: Chunk metadatas
+        """
+        self.papers.append(result)
+        self.documents.extend(documents)
+        self.ids.extend(ids)
+        self.metadatas.extend(metadatas)
+    
+    def drain(self) -> tuple:
+        """
+        Empty the buffer
+        
+        Returns:
+            Tuple of (papers, documents, ids, metadatas) that were staged
+        """
+        staged = (self.papers, self.documents, self.ids, self.metadatas)
+        self.papers, self.documents, self.ids, self.metadatas = [], [], [], []
+        return staged
+
 
 class RAGEngine:
     """Main RAG pipeline orchestrator"""
@@ -26,19 +72,57 @@ class RAGEngine:
         self,
         vector_store_path: str = "./chroma_db",
         embedding_model: str = "BAAI/bge-large-en-v1.5",
-        llm_api_key: str = None
+        llm_api_key: str = None,
+        result_cache_path: str = "./query_cache.db",
+        embedding_backend: str = "sentence-transformers",
+        vector_store_backend: str = "chroma",
+        use_pq: bool = False,
+        use_pca: bool = False,
+        query_batch_window_ms: float = 0
     ):
         """
         Initialize RAG engine
         
         Parameters:
-            vector_store_path: Path to ChromaDB storage
+            vector_store_path: Path to vector store storage
             embedding_model: Name of embedding model to use
             llm_api_key: Gemini API key
+            result_cache_path: Path to the SQLite query result cache
+            embedding_backend: 'sentence-transformers' or 'onnx'
+            vector_store_backend: 'chroma' or 'faiss'
+            use_pq: Serve unfiltered Chroma queries from an in-memory PQ index
+            use_pca: Reduce Chroma vectors with PCA once enough chunks are stored
+            query_batch_window_ms: If > 0, coalesce concurrent retrievals arriving
+                within this window into one vector store call
         """
-        self.vector_store = VectorStore(persist_directory=vector_store_path)
-        self.embedding_generator = get_embedding_generator(model_name=embedding_model)
+        if vector_store_backend == "faiss":
+            # Optional dependency, only imported when selected
+            from faiss_vector_store import FaissVectorStore
+            self.vector_store = FaissVectorStore(persist_directory=vector_store_path)
+        else:
+            self.vector_store = VectorStore(
+                persist_directory=vector_store_path,
+                use_pq=use_pq,
+                use_pca=use_pca
+            )
+        self.embedding_generator = get_embedding_generator(
+            model_name=embedding_model,
+            backend=embedding_backend
+        )
         self.llm_client = get_llm_client(api_key=llm_api_key)
+        self.result_cache = ResultCache(db_path=result_cache_path)
+        
+        # Repeated questions skip the embedding model entirely
+        self._query_embeddings = LRUCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+        
+        # Retrieval goes through the batcher when enabled; both expose query()
+        self.retriever = self.vector_store
+        if query_batch_window_ms > 0:
+            self.retriever = QueryBatcher(self.vector_store, window_ms=query_batch_window_ms)
+        
+        # Serializes writers (ingest/delete) so a cache invalidation can't
+        # interleave with another paper's write; queries take no lock
+        self._write_lock = threading.Lock()
         
         logger.info("RAG Engine initialized successfully")
     
@@ -124,6 +208,49 @@ class RAGEngine:
         Returns:
             Dictionary with ingestion results
         """
+        return self.ingest_papers([paper_data], chunk_size, chunk_overlap)[0]
+    
+    def ingest_papers(
+        self,
+        papers_data: List[Dict[str, Any]],
+        chunk_size: int = 500,
+        chunk_overlap: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Ingest several papers, embedding all of their chunks together
+        
+        Parameters:
+            papers_data: List of paper dictionaries (see ingest_paper)
+            chunk_size: Size of text chunks
+            chunk_overlap: Overlap between chunks
+        
+        Returns:
+            List of ingestion results, one per paper
+        """
+        buffer = StagingBuffer()
+        results = [self.stage_paper(buffer, paper_data, chunk_size, chunk_overlap) for paper_data in papers_data]
+        flushed = iter(self.flush(buffer))
+        return [next(flushed) if result is None else result for result in results]
+    
+    def stage_paper(
+        self,
+        buffer: 'StagingBuffer',
+        paper_data: Dict[str, Any],
+        chunk_size: int = 500,
+        chunk_overlap: int = 50
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Chunk a paper into a staging buffer; nothing is embedded until flush()
+        
+        Parameters:
+            buffer: Staging buffer to append the paper's chunks to
+            paper_data: Paper dictionary (see ingest_paper)
+            chunk_size: Size of text chunks
+            chunk_overlap: Overlap between chunks
+        
+        Returns:
+            None if the paper was staged, otherwise a failed ingestion result
+        """
         try:
             paper_id = paper_data.get('paper_id')
             title = paper_data.get('title', 'Unknown')
@@ -137,9 +264,9 @@ class RAGEngine:
             logger.info(f"Ingesting paper: {title}")
             
             all_chunks = []
-            all_embeddings = []
             all_metadatas = []
             all_ids = []
+            upload_date = datetime.now().isoformat()
             
             # Process each section
             for section in sections:
@@ -172,7 +299,7 @@ class RAGEngine:
                         'section': section_name,
                         'page': str(page),
                         'chunk_index': i,
-                        'upload_date': datetime.now().isoformat()
+                        'upload_date': upload_date
                     })
             
             if not all_chunks:
@@ -182,32 +309,19 @@ class RAGEngine:
                     'chunks_processed': 0
                 }
             
-            # Generate embeddings for all chunks
-            logger.info(f"Generating embeddings for {len(all_chunks)} chunks...")
-            all_embeddings = self.embedding_generator.encode_text(all_chunks)
-            
-            # Store in vector database
-            success = self.vector_store.add_documents(
-                documents=all_chunks,
-                embeddings=all_embeddings,
-                metadatas=all_metadatas,
-                ids=all_ids
-            )
-            
-            if success:
-                return {
+            buffer.add_paper(
+                {
                     'success': True,
                     'paper_id': paper_id,
                     'title': title,
                     'chunks_processed': len(all_chunks),
                     'sections_processed': len(sections)
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': 'Failed to store chunks in vector database',
-                    'chunks_processed': 0
-                }
+                },
+                all_chunks,
+                all_ids,
+                all_metadatas
+            )
+            return None
         
         except Exception as e:
             logger.error(f"Error ingesting paper: {e}")
@@ -217,6 +331,47 @@ class RAGEngine:
                 'chunks_processed': 0
             }
     
+    def flush(self, buffer: 'StagingBuffer') -> List[Dict[str, Any]]:
+        """
+        Embed every chunk in a staging buffer in one pass and store them
+        
+        Parameters:
+            buffer: Staging buffer filled by stage_paper()
+        
+        Returns:
+            List of ingestion results, one per staged paper, in staging order
+        """
+        papers, documents, ids, metadatas = buffer.drain()
+        if not papers:
+            return []
+        
+        try:
+            # Generate embeddings for all staged chunks
+            logger.info(f"Generating embeddings for {len(documents)} chunks from {len(papers)} paper(s)...")
+            embeddings = self.embedding_generator.encode_text(documents, as_numpy=True)
+            
+            # Store in vector database
+            with self._write_lock:
+                success = self.vector_store.add_documents(
+                    documents=documents,
+                    embeddings=embeddings,
+                    metadatas=metadatas,
+                    ids=ids
+                )
+                if success:
+                    for paper in papers:
+                        self.result_cache.invalidate_paper(paper['paper_id'])
+            
+            if success:
+                return papers
+            error = 'Failed to store chunks in vector database'
+        
+        except Exception as e:
+            logger.error(f"Error ingesting paper: {e}")
+            error = str(e)
+        
+        return [{'success': False, 'error': error, 'chunks_processed': 0} for _ in papers]
+    
     def query(
         self,
         query: str,
@@ -237,8 +392,18 @@ class RAGEngine:
         try:
             logger.info(f"Processing query: {query}")
             
+            # Answers are a pure function of (query, papers searched) until a paper changes
+            cache_key = self.result_cache.make_key(query, paper_ids, n_results)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached query result")
+                return cached
+            
             # Generate query embedding
-            query_embedding = self.embedding_generator.encode_query(query)
+            query_embedding = self._query_embeddings.get(query)
+            if query_embedding is None:
+                query_embedding = self.embedding_generator.encode_query(query)
+                self._query_embeddings.set(query, query_embedding)
             
             # Build filter if paper_ids specified
             where_filter = None
@@ -250,7 +415,7 @@ class RAGEngine:
                     where_filter = {"paper_id": {"$in": paper_ids}}
             
             # Retrieve relevant chunks
-            results = self.vector_store.query(
+            results = self.retriever.query(
                 query_embedding=query_embedding,
                 n_results=n_results,
                 where=where_filter
@@ -264,17 +429,18 @@ class RAGEngine:
                 }
             
             # Prepare contexts for LLM
-            contexts = []
-            for doc, metadata, distance in zip(
-                results['documents'],
-                results['metadatas'],
-                results['distances']
-            ):
-                contexts.append({
+            contexts = [
+                {
                     'text': doc,
                     'metadata': metadata,
                     'relevance_score': 1 - distance  # Convert distance to similarity
-                })
+                }
+                for doc, metadata, distance in zip(
+                    results['documents'],
+                    results['metadatas'],
+                    results['distances']
+                )
+            ]
             
             # Generate answer using LLM
             llm_response = self.llm_client.generate_answer(
@@ -282,13 +448,19 @@ class RAGEngine:
                 contexts=contexts
             )
             
-            return {
+            result = {
                 'answer': llm_response['answer'],
                 'citations': llm_response['citations'],
                 'contexts': contexts,
                 'model': llm_response.get('model', 'unknown'),
                 'contexts_used': len(contexts)
             }
+            
+            # Don't pin transient LLM failures in the cache
+            if 'error' not in llm_response:
+                self.result_cache.set(cache_key, result, paper_ids)
+            
+            return result
         
         except Exception as e:
             logger.error(f"Error processing query: {e}")
@@ -369,14 +541,27 @@ class RAGEngine:
                 'error': str(e)
             }
     
-    def list_papers(self) -> List[Dict[str, Any]]:
+    def list_papers(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
         """
-        List all papers in the system
+        List papers in the system
+        
+        Parameters:
+            limit: Maximum number of papers to return (None for all)
+            offset: Number of papers to skip
         
         Returns:
             List of papers with metadata
         """
-        return self.vector_store.list_papers()
+        return self.vector_store.list_papers(limit=limit, offset=offset)
+    
+    def count_papers(self) -> int:
+        """
+        Count papers in the system
+        
+        Returns:
+            Number of papers
+        """
+        return self.vector_store.count_papers()
     
     def delete_paper(self, paper_id: str) -> bool:
         """
@@ -388,7 +573,11 @@ class RAGEngine:
         Returns:
             True if successful
         """
-        return self.vector_store.delete_paper(paper_id)
+        with self._write_lock:
+            success = self.vector_store.delete_paper(paper_id)
+            if success:
+                self.result_cache.invalidate_paper(paper_id)
+        return success
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -397,12 +586,9 @@ class RAGEngine:
         Returns:
             Statistics dictionary
         """
-        papers = self.list_papers()
-        total_chunks = self.vector_store.count_documents()
-        
         return {
-            'total_papers': len(papers),
-            'total_chunks': total_chunks,
+            'total_papers': self.count_papers(),
+            'total_chunks': self.vector_store.count_documents(),
             'embedding_model': self.embedding_generator.model_name,
             'embedding_dimension': self.embedding_generator.get_embedding_dimension(),
             'llm_model': self.llm_client.model_name
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Result Cache Module
+SQLite-backed cache of RAG query results, invalidated when papers change
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from contextlib import closing
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Papers are immutable once ingested, so entries only go stale through
+# ingestion/deletion (handled by invalidate_paper) or this TTL
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# Scope marker for queries that search across every paper
+ALL_PAPERS_SCOPE = "*"
+
+
+class ResultCache:
+    """Caches query results keyed by (query, paper scope, n_results)"""
+
+    def __init__(self, db_path: str = "./query_cache.db", ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        """
+        Initialize result cache
+
+        Parameters:
+            db_path: Path to the SQLite cache file
+            ttl_seconds: Time after which cached results expire
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+
+        cache_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(cache_dir, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS query_cache (
+                    key TEXT PRIMARY KEY,
+                    scope TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_query_cache_scope ON query_cache(scope)")
+
+        logger.info(f"Initialized result cache at: {db_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection (one per operation, so it is safe across Flask threads)"""
+        return sqlite3.connect(self.db_path, timeout=5.0)
+
+    @staticmethod
+    def _scope(paper_ids: Optional[List[str]]) -> str:
+        """
+        Build the scope string for a set of paper IDs
+
+        Parameters:
+            paper_ids: Paper IDs the query is restricted to, or None for all papers
+
+        Returns:
+            Scope string, delimited so a single ID can be matched with LIKE
+        """
+        if not paper_ids:
+            return ALL_PAPERS_SCOPE
+        return "," + ",".join(sorted(set(paper_ids))) + ","
+
+    def make_key(self, query: str, paper_ids: Optional[List[str]] = None, n_results: int = 5) -> str:
+        """
+        Build the cache key for a query
+
+        Parameters:
+            query: User's question
+            paper_ids: Optional list of paper IDs the query is restricted to
+            n_results: Number of context chunks retrieved
+
+        Returns:
+            Hex digest cache key
+        """
+        content = f"{self._scope(paper_ids)}|{n_results}|{query.lower().strip()}"
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result
+
+        Parameters:
+            key: Cache key from make_key
+
+        Returns:
+            Cached result dictionary, or None on miss/expiry
+        """
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT result, created_at FROM query_cache WHERE key = ?", (key,)
+                ).fetchone()
+
+            if row is None:
+                return None
+
+            result, created_at = row
+            if time.time() - created_at > self.ttl_seconds:
+                return None
+
+            return json.loads(result)
+        except Exception as e:
+            logger.warning(f"Error reading result cache: {e}")
+            return None
+
+    def set(self, key: str, result: Dict[str, Any], paper_ids: Optional[List[str]] = None) -> None:
+        """
+        Store a result in the cache
+
+        Parameters:
+            key: Cache key from make_key
+            result: JSON-serializable result dictionary
+            paper_ids: Paper IDs the query was restricted to, or None for all papers
+        """
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO query_cache (key, scope, result, created_at) VALUES (?, ?, ?, ?)",
+                    (key, self._scope(paper_ids), json.dumps(result), time.time())
+                )
+        except Exception as e:
+            logger.warning(f"Error writing result cache: {e}")
+
+    def invalidate_paper(self, paper_id: str) -> None:
+        """
+        Drop every cached result that could include the given paper
+
+        Parameters:
+            paper_id: Paper ID that was ingested or deleted
+        """
+        try:
+            with closing(self._connect()) as conn, conn:
+                cursor = conn.execute(
+                    "DELETE FROM query_cache WHERE scope = ? OR scope LIKE ?",
+                    (ALL_PAPERS_SCOPE, f"%,{paper_id},%")
+                )
+            logger.info(f"Invalidated {cursor.rowcount} cached results for paper {paper_id}")
+        except Exception as e:
+            logger.warning(f"Error invalidating result cache: {e}")
@@ -0,0 +1,39 @@
+"""
+Shared pytest setup: make the backend modules importable from the test directory,
+and helpers for filling a vector store
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def random_vectors():
+    """Factory for reproducible unit-length float32 vectors: random_vectors(n, dimension, seed)"""
+    def make(n, dimension, seed):
+        x = np.random.default_rng(seed).normal(size=(n, dimension)).astype(np.float32)
+        return x / np.linalg.norm(x, axis=1, keepdims=True)
+    return make
+
+
+@pytest.fixture
+def add_paper():
+    """Add one chunk per vector to a store under IDs "<paper_id>-<i>", returning the IDs"""
+    def add(store, paper_id, vectors):
+        ids = [f"{paper_id}-{i}" for i in range(len(vectors))]
+        assert store.add_documents(
+            documents=[f"text of {chunk_id}" for chunk_id in ids],
+            embeddings=vectors,
+            metadatas=[
+                {"paper_id": paper_id, "title": f"Title {paper_id}", "chunk_index": i}
+                for i in range(len(ids))
+            ],
+            ids=ids
+        )
+        return ids
+    return add
@@ -0,0 +1,152 @@
+"""
+Unit tests for FaissVectorStore: bfloat16 flat tier, switch to IVF-PQ at
+the threshold, background maintenance and reloading from disk (no server needed)
+"""
+
+import threading
+from contextlib import closing
+
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+import faiss_vector_store
+from faiss_vector_store import FaissVectorStore
+
+DIMENSION = 32
+THRESHOLD = 1200
+PAPER_SIZE = 200
+
+
+@pytest.fixture(autouse=True)
+def small_ivf(monkeypatch):
+    monkeypatch.setattr(faiss_vector_store, "IVFPQ_TRAIN_THRESHOLD", THRESHOLD)
+    monkeypatch.setattr(faiss_vector_store, "IVF_NLIST", 16)
+    monkeypatch.setattr(faiss_vector_store, "IVF_NPROBE", 16)
+
+
+def open_store(directory):
+    return FaissVectorStore(str(directory), use_gpu=False, auto_maintenance=False)
+
+
+def test_flat_tier_stores_bfloat16(tmp_path, random_vectors, add_paper):
+    store = open_store(tmp_path)
+    vectors = random_vectors(PAPER_SIZE, DIMENSION, seed=0)
+    ids = add_paper(store, "p0", vectors)
+
+    assert not store._is_ivf()
+    quantizer = faiss.downcast_index(store.index.index)
+    assert quantizer.sq.qtype == faiss.ScalarQuantizer.QT_bf16
+
+    result = store.query(vectors[3].tolist(), n_results=3)
+    assert result["ids"][0] == ids[3]
+    assert result["distances"][0] == pytest.approx(0.0, abs=1e-2)
+
+
+def test_switches_to_ivfpq_at_threshold_and_reloads(tmp_path, random_vectors, add_paper):
+    store = open_store(tmp_path)
+    papers = {}
+    for n in range(THRESHOLD // PAPER_SIZE):
+        vectors = random_vectors(PAPER_SIZE, DIMENSION, seed=n)
+        papers[f"p{n}"] = (add_paper(store, f"p{n}", vectors), vectors)
+
+    # Writes never retrain or save; that is left to maintenance
+    assert not store._is_ivf()
+    assert not (tmp_path / "academic_papers.index").exists()
+
+    store.run_maintenance()
+    assert store._is_ivf()
+    assert store.index.ntotal == THRESHOLD
+    assert (tmp_path / "academic_papers.index").exists()
+
+    ids, vectors = papers["p2"]
+    assert ids[10] in store.query(vectors[10].tolist(), n_results=5)["ids"]
+    filtered = store.query(vectors[10].tolist(), n_results=5, where={"paper_id": "p2"})
+    assert filtered["ids"] and all(chunk_id.startswith("p2-") for chunk_id in filtered["ids"])
+
+    reloaded = open_store(tmp_path)
+    assert reloaded._is_ivf()
+    assert reloaded.index.ntotal == THRESHOLD
+    assert reloaded.count_documents() == THRESHOLD
+    assert reloaded.count_papers() == len(papers)
+    assert reloaded.query(vectors[10].tolist(), n_results=5)["ids"] == \
+        store.query(vectors[10].tolist(), n_results=5)["ids"]
+
+    assert reloaded.delete_paper("p2")
+    assert reloaded.index.ntotal == THRESHOLD - PAPER_SIZE
+    assert not any(
+        chunk_id.startswith("p2-")
+        for chunk_id in reloaded.query(vectors[10].tolist(), n_results=20)["ids"]
+    )
+
+
+def test_writes_during_retraining_are_kept(tmp_path, monkeypatch, random_vectors, add_paper):
+    store = open_store(tmp_path)
+    for n in range(THRESHOLD // PAPER_SIZE):
+        add_paper(store, f"p{n}", random_vectors(PAPER_SIZE, DIMENSION, seed=n))
+
+    late = random_vectors(10, DIMENSION, seed=50)
+    train = faiss.IndexIVFPQ.train
+
+    def write_during_training(index, vectors):
+        monkeypatch.setattr(faiss.IndexIVFPQ, "train", train)
+        add_paper(store, "late", late)
+        assert store.delete_paper("p1")
+        train(index, vectors)
+
+    monkeypatch.setattr(faiss.IndexIVFPQ, "train", write_during_training)
+    store.run_maintenance()
+
+    assert store._is_ivf()
+    assert store.index.ntotal == THRESHOLD - PAPER_SIZE + len(late)
+    assert "late-3" in store.query(late[3].tolist(), n_results=5)["ids"]
+    with closing(store._connect()) as conn:
+        stored = sorted(row[0] for row in conn.execute("SELECT rowid FROM chunks"))
+    assert sorted(faiss_vector_store._index_ids(store.index).tolist()) == stored
+
+
+def test_unsaved_writes_are_recovered_on_reload(tmp_path, random_vectors, add_paper):
+    store = open_store(tmp_path)
+    vectors = random_vectors(PAPER_SIZE, DIMENSION, seed=0)
+    add_paper(store, "p0", vectors)
+    add_paper(store, "p1", random_vectors(PAPER_SIZE, DIMENSION, seed=1))
+    store.run_maintenance()
+
+    # Changed after the last save, as if the process then crashed
+    late = random_vectors(5, DIMENSION, seed=2)
+    add_paper(store, "late", late)
+    assert store.delete_paper("p1")
+
+    reloaded = open_store(tmp_path)
+    assert reloaded.index.ntotal == 2 * PAPER_SIZE
+    reloaded.run_maintenance()
+    assert reloaded.index.ntotal == PAPER_SIZE + len(late)
+    assert reloaded.query(late[2].tolist(), n_results=3)["ids"][0] == "late-2"
+    assert reloaded.query(vectors[7].tolist(), n_results=3)["ids"][0] == "p0-7"
+
+
+def test_searches_do_not_wait_for_writers(tmp_path, random_vectors, add_paper):
+    store = open_store(tmp_path)
+    vectors = random_vectors(PAPER_SIZE, DIMENSION, seed=0)
+    add_paper(store, "p0", vectors)
+
+    # A writer or maintenance pass holding the write lock doesn't block queries
+    results = []
+    with store._write_lock:
+        searcher = threading.Thread(
+            target=lambda: results.append(store.query(vectors[4].tolist(), n_results=3))
+        )
+        searcher.start()
+        searcher.join(timeout=5)
+        assert not searcher.is_alive()
+    assert results[0]["ids"][0] == "p0-4"
+
+
+def test_warns_when_bfloat16_is_unavailable(monkeypatch, caplog):
+    monkeypatch.delattr(faiss.ScalarQuantizer, "QT_bf16")
+
+    with caplog.at_level("WARNING", logger="faiss_vector_store"):
+        index = faiss_vector_store._flat_index(DIMENSION)
+
+    assert faiss.downcast_index(index.index).sq.qtype == faiss.ScalarQuantizer.QT_fp16
+    assert "float16" in caplog.text
@@ -0,0 +1,136 @@
+"""
+Unit tests for the PCA migration of the Chroma vector store (no server needed)
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("chromadb")
+pytest.importorskip("sklearn")
+
+import pca_projector
+import vector_store
+from pca_projector import PCAProjector
+from vector_store import VectorStore, COLLECTION_NAME, PCA_COLLECTION_NAME
+
+DIMENSION = 64
+COMPONENTS = 8
+TRAIN_SIZE = 300
+PAPER_SIZE = 120
+
+# Low-rank data, so an 8-component projection keeps nearest neighbours intact
+BASIS = np.random.default_rng(0).normal(size=(COMPONENTS, DIMENSION))
+
+
+def paper_vectors(seed, n=PAPER_SIZE):
+    latent = np.random.default_rng(seed).normal(size=(n, COMPONENTS))
+    return (latent @ BASIS).astype(np.float32)
+
+
+class SmallPCA(PCAProjector):
+    # Set by a test to write to the store while the projection is being fitted
+    during_fit = None
+
+    def __init__(self, path, n_components=COMPONENTS):
+        super().__init__(path, n_components)
+
+    def fit(self, vectors):
+        if SmallPCA.during_fit is not None:
+            SmallPCA.during_fit()
+        return super().fit(vectors)
+
+
+@pytest.fixture(autouse=True)
+def small_pca(monkeypatch):
+    monkeypatch.setattr(pca_projector, "PCA_MIN_TRAIN_SIZE", TRAIN_SIZE)
+    monkeypatch.setattr(vector_store, "PCA_MIN_TRAIN_SIZE", TRAIN_SIZE)
+    monkeypatch.setattr(vector_store, "PCAProjector", SmallPCA)
+    monkeypatch.setattr(SmallPCA, "during_fit", None)
+
+
+def test_migration_preserves_ids_and_metadata(tmp_path, add_paper):
+    store = VectorStore(str(tmp_path), use_pca=True, auto_maintenance=False)
+    papers = {f"p{n}": paper_vectors(seed=n) for n in range(3)}
+    for paper_id, vectors in papers.items():
+        add_paper(store, paper_id, vectors)
+
+    # Writes never migrate; that is left to maintenance
+    assert store.collection_name == COLLECTION_NAME
+    before = store.query(papers["p0"][5].tolist(), n_results=3)
+    assert before["ids"][0] == "p0-5"
+
+    # Writes made while the projection is fitted are carried over
+    late = paper_vectors(seed=7, n=10)
+    def write_during_fit():
+        SmallPCA.during_fit = None
+        add_paper(store, "late", late)
+        assert store.delete_paper("p1")
+    SmallPCA.during_fit = write_during_fit
+
+    store.run_maintenance()
+
+    assert store.collection_name == PCA_COLLECTION_NAME
+    assert store.pca.is_fitted
+    expected_ids = {f"p0-{i}" for i in range(PAPER_SIZE)} | {f"p2-{i}" for i in range(PAPER_SIZE)} \
+        | {f"late-{i}" for i in range(10)}
+    assert set(store.collection.get(include=[])["ids"]) == expected_ids
+    assert store.count_documents() == len(expected_ids)
+    assert {paper["paper_id"] for paper in store.list_papers()} == {"p0", "p2", "late"}
+
+    chunk = store.collection.get(ids=["p2-17"], include=["documents", "metadatas", "embeddings"])
+    assert chunk["documents"] == ["text of p2-17"]
+    assert chunk["metadatas"] == [{"paper_id": "p2", "title": "Title p2", "chunk_index": 17}]
+    assert len(chunk["embeddings"][0]) == COMPONENTS
+
+    # The same query is answered by the reduced collection, not from the cache
+    after = store.query(papers["p0"][5].tolist(), n_results=3)
+    assert after["ids"][0] == "p0-5"
+    assert after["distances"] != before["distances"]
+    assert store.query(late[3].tolist(), n_results=3)["ids"][0] == "late-3"
+
+    # Later writes are projected too
+    add_paper(store, "p9", paper_vectors(seed=9, n=5))
+    assert store.query(paper_vectors(seed=9, n=5)[2].tolist(), n_results=3)["ids"][0] == "p9-2"
+
+    reopened = VectorStore(str(tmp_path), use_pca=True, auto_maintenance=False)
+    assert reopened.collection_name == PCA_COLLECTION_NAME
+    assert reopened.count_documents() == len(expected_ids) + 5
+    assert [c.name for c in reopened.client.list_collections()] == [PCA_COLLECTION_NAME]
+
+
+def test_reset_during_fit_abandons_migration(tmp_path, add_paper):
+    store = VectorStore(str(tmp_path), use_pca=True, auto_maintenance=False)
+    for n in range(3):
+        add_paper(store, f"p{n}", paper_vectors(seed=n))
+
+    def reset_during_fit():
+        SmallPCA.during_fit = None
+        assert store.reset()
+    SmallPCA.during_fit = reset_during_fit
+
+    store.run_maintenance()
+
+    assert store.collection_name == COLLECTION_NAME
+    assert not store.pca.is_fitted
+    assert store.count_documents() == 0
+    assert [c.name for c in store.client.list_collections()] == [COLLECTION_NAME]
+
+
+def test_query_retries_when_migration_drops_its_collection(tmp_path, monkeypatch, add_paper):
+    store = VectorStore(str(tmp_path), use_pca=True, auto_maintenance=False)
+    vectors = paper_vectors(seed=0)
+    for n in range(3):
+        add_paper(store, f"p{n}", paper_vectors(seed=n))
+
+    # The migration finishes after the query picked its collection, but before it searched
+    search_batch = store._search_batch
+    def migrate_then_search(collection, *args):
+        monkeypatch.setattr(store, "_search_batch", search_batch)
+        store.run_maintenance()
+        return search_batch(collection, *args)
+    monkeypatch.setattr(store, "_search_batch", migrate_then_search)
+
+    result = store.query(vectors[5].tolist(), n_results=3)
+
+    assert store.collection_name == PCA_COLLECTION_NAME
+    assert result["ids"][0] == "p0-5"
@@ -0,0 +1,114 @@
+"""
+Unit tests for the PQ tier: train/add/remove round-trip, persistence and
+VectorStore maintenance (no server needed)
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+import pq_index
+from pq_index import PQIndex
+
+DIMENSION = 32
+N_SUBVECTORS = 8
+N_CENTROIDS = 16
+TRAIN_SIZE = 400
+
+
+@pytest.fixture(autouse=True)
+def small_training_threshold(monkeypatch):
+    monkeypatch.setattr(pq_index, "PQ_MIN_TRAIN_SIZE", TRAIN_SIZE)
+
+
+def make_index(directory):
+    return PQIndex(str(directory), n_subvectors=N_SUBVECTORS, n_centroids=N_CENTROIDS)
+
+
+def test_train_add_remove_round_trip(tmp_path, random_vectors):
+    index = make_index(tmp_path)
+    vectors = random_vectors(TRAIN_SIZE, DIMENSION, seed=0)
+    ids = [f"chunk-{i}" for i in range(TRAIN_SIZE)]
+
+    assert not index.train(ids[:10], vectors[:10])
+    assert index.train(ids, vectors)
+    assert index.is_trained
+    assert len(index) == TRAIN_SIZE
+
+    found, distances = index.search(vectors[7], n_results=5)
+    assert "chunk-7" in found
+    assert distances == sorted(distances)
+
+    # New chunks are searchable; re-adding an ID replaces its code
+    extra = random_vectors(3, DIMENSION, seed=1)
+    index.add(["new-0", "new-1", "new-2"], extra)
+    index.add(["new-0"], extra[:1])
+    assert len(index) == TRAIN_SIZE + 3
+    assert "new-1" in index.search(extra[1], n_results=5)[0]
+
+    index.remove(["new-1", "chunk-7"])
+    assert len(index) == TRAIN_SIZE + 1
+    found, _ = index.search(extra[1], n_results=TRAIN_SIZE + 1)
+    assert "new-1" not in found
+    assert "chunk-7" not in found
+
+
+def test_changes_are_saved_only_on_flush(tmp_path, random_vectors):
+    index = make_index(tmp_path)
+    vectors = random_vectors(TRAIN_SIZE, DIMENSION, seed=2)
+    index.train([f"chunk-{i}" for i in range(TRAIN_SIZE)], vectors)
+    assert not make_index(tmp_path).is_trained
+
+    assert index.flush()
+    assert not index.flush()
+
+    index.remove(["chunk-0"])
+    assert len(make_index(tmp_path)) == TRAIN_SIZE
+    assert index.flush()
+
+    reloaded = make_index(tmp_path)
+    assert reloaded.is_trained
+    np.testing.assert_array_equal(reloaded.ids, index.ids)
+    np.testing.assert_array_equal(reloaded._table[1], index._table[1])
+    assert reloaded.search(vectors[5], n_results=3) == index.search(vectors[5], n_results=3)
+
+    reloaded.reset()
+    assert not make_index(tmp_path).is_trained
+
+
+def test_vector_store_maintenance_trains_and_syncs(tmp_path, monkeypatch, random_vectors, add_paper):
+    pytest.importorskip("chromadb")
+    import vector_store
+    from vector_store import VectorStore
+
+    monkeypatch.setattr(vector_store, "PQ_MIN_TRAIN_SIZE", TRAIN_SIZE)
+    monkeypatch.setattr(
+        vector_store, "PQIndex",
+        lambda directory: PQIndex(directory, n_subvectors=N_SUBVECTORS, n_centroids=N_CENTROIDS)
+    )
+
+    store = VectorStore(str(tmp_path), use_pq=True, auto_maintenance=False)
+    add_paper(store, "a", random_vectors(TRAIN_SIZE, DIMENSION, seed=3))
+    assert not store.pq_index.is_trained
+
+    store.run_maintenance()
+    assert store.pq_index.is_trained
+    assert len(store.pq_index) == TRAIN_SIZE
+
+    # After training, writes update the codes in memory only
+    new_vectors = random_vectors(5, DIMENSION, seed=4)
+    new_ids = add_paper(store, "b", new_vectors)
+    assert len(store.pq_index) == TRAIN_SIZE + 5
+    assert store.query(new_vectors[2].tolist(), n_results=3)["ids"][0] == new_ids[2]
+
+    # A process that starts before they were saved reconciles with the collection
+    reopened = VectorStore(str(tmp_path), use_pq=True, auto_maintenance=False)
+    assert len(reopened.pq_index) == TRAIN_SIZE
+    reopened.run_maintenance()
+    assert sorted(reopened.pq_index.ids.tolist()) == sorted(store.pq_index.ids.tolist())
+
+    assert store.delete_paper("b")
+    assert len(store.pq_index) == TRAIN_SIZE
+    store.run_maintenance()
+    assert len(VectorStore(str(tmp_path), use_pq=True, auto_maintenance=False).pq_index) == TRAIN_SIZE
@@ -0,0 +1,55 @@
+"""
+Unit tests for TextProcessor's TF-IDF corpus scoring (no server needed)
+"""
+
+import warnings
+
+import pytest
+
+pytest.importorskip("sklearn")
+
+from text_processor import TextProcessor
+
+CORPUS = [
+    "Rising sea levels and ocean warming are driven by climate change.",
+    "The cat sat on the mat and didn't move all afternoon.",
+    "We don't yet know how climate policy will shape energy markets.",
+    "Transformers improved machine translation quality on every benchmark.",
+]
+
+
+@pytest.fixture
+def processor():
+    tp = TextProcessor()
+    tp.fit_corpus(CORPUS)
+    return tp
+
+
+def test_fit_corpus_has_no_stopword_fragments():
+    tp = TextProcessor()
+    # Contracted stopwords only, so the fragments clean_text splits them
+    # into ("don", "t") are not stopwords unless fit_corpus derives them
+    tp.stop_words = frozenset({"the", "and", "on", "all", "we", "yet", "don't", "didn't", "it's"})
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert tp.fit_corpus(CORPUS) == len(CORPUS)
+
+    vocabulary = tp._tfidf.vocabulary_
+    for fragment in ("don", "didn", "t", "s"):
+        assert fragment not in vocabulary
+
+
+def test_score_topic_ranks_relevant_documents_first(processor):
+    scores = processor.score_topic("climate change")
+
+    assert scores.shape == (len(CORPUS),)
+    ranking = list(scores.argsort()[::-1])
+    assert ranking[0] == 0
+    assert ranking[1] == 2
+    assert scores[1] == 0.0
+    assert scores[3] == 0.0
+
+
+def test_score_topic_requires_fit():
+    with pytest.raises(ValueError):
+        TextProcessor().score_topic("climate")
@@ -10,18 +10,202 @@ import os
 import re
 import logging
 import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize, sent_tokenize
 from collections import Counter
 from nltk.stem import WordNetLemmatizer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+
+from memory_cache import LRUCache
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
+# Precompiled cleaning patterns (clean_text runs on every sentence in the topic methods).
+# URLs, email addresses and special characters all become a space, so they are
+# stripped in one pass; punctuation used for sentence splitting is kept.
+_STRIP_RE = re.compile(r'https?://\S+|www\.\S+|\S+@\S+|[^\w\s.,!?]')
+_WS_RE = re.compile(r'\s+')
+
+# Read size used when streaming plain text files
+TEXT_READ_CHUNK_SIZE = 1 << 20
+
+# Rows read from a CSV file to pick its text/title columns
+CSV_SAMPLE_ROWS = 100
+
+# Word sets of recently processed documents, kept for topic scoring
+WORD_SET_CACHE_SIZE = 256
+
+# Regex tokenizers used instead of NLTK's Punkt on the hot paths: words are runs
+# of letters (optionally joined by apostrophes), sentences end at . ! or ?
+_WORD_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+# Predefined texts used by generate_topic_text
+_RAW_TOPIC_TEXTS = {
+    'ai': """
+        Artificial Intelligence (AI) is revolutionizing industries across the globe. 
+        Machine learning algorithms are becoming increasingly sophisticated, enabling computers to perform tasks 
+        that once required human intelligence. Deep learning, a subset of AI, has made significant breakthroughs 
+        in image recognition, natural language processing, and autonomous vehicles. However, concerns about AI ethics, 
+        job displacement, and privacy issues have also emerged. Some experts worry about the potential for AI to 
+        surpass human intelligence, while others see it as a tool that will enhance human capabilities. 
+        Companies like Google, Microsoft, and OpenAI are investing billions in AI research and development. 
+        The future of AI looks promising but requires careful consideration of its societal impacts.
+    """,
+    
+    'climate change': """
+        Climate change represents one of the most pressing challenges of our time. Rising global temperatures 
+        have led to melting ice caps, rising sea levels, and increasingly severe weather events. Many scientists 
+        warn that without immediate action, we face catastrophic consequences. Efforts to combat climate change 
+        include renewable energy adoption, carbon capture technologies, and international agreements like the 
+        Paris Accord. However, progress has been slow, and some countries continue to prioritize economic growth 
+        over environmental concerns. Activists like Greta Thunberg have brought global attention to the urgency 
+        of the situation, while some politicians and industry leaders remain skeptical about the severity of the 
+        problem or the need for dramatic action.
+    """,
+    
+    'healthcare': """
+        The healthcare industry is undergoing rapid transformation due to technological advancements and changing 
+        patient expectations. Telemedicine has expanded access to care, particularly in rural areas and during the 
+        COVID-19 pandemic. Electronic health records have improved information sharing among providers but have 
+        also raised concerns about data security. Precision medicine is enabling more personalized treatment plans 
+        based on genetic factors. However, healthcare costs continue to rise in many countries, creating barriers 
+        to access for vulnerable populations. The debate over universal healthcare remains contentious, with 
+        proponents citing improved outcomes and equity, while critics worry about quality of care and economic impacts. 
+        Mental health services have gained increased attention but still face stigma and funding challenges.
+    """,
+    
+    'education': """
+        Education systems worldwide are evolving to meet the demands of the 21st century. Digital learning tools 
+        and online courses have expanded access to education beyond traditional classrooms. The COVID-19 pandemic 
+        accelerated this trend, forcing schools and universities to adopt remote learning models. However, this 
+        transition highlighted the digital divide, as students without reliable internet access or appropriate 
+        devices fell behind. STEM education has received increased emphasis, reflecting the growing importance of 
+        technical skills in the job market. At the same time, there's recognition of the continued value of liberal 
+        arts education in developing critical thinking and communication skills. Issues of educational equity persist, 
+        with significant disparities in resources and outcomes based on socioeconomic status, race, and geography.
+    """,
+    
+    'cryptocurrency': """
+        Cryptocurrency has emerged as a disruptive force in the financial world. Bitcoin, the first and most 
+        well-known cryptocurrency, has experienced dramatic price fluctuations since its creation in 2009. 
+        Blockchain technology, which underlies most cryptocurrencies, offers potential benefits beyond digital 
+        currencies, including secure supply chain management and voting systems. Some countries have embraced 
+        cryptocurrency, with El Salvador even adopting Bitcoin as legal tender. Others have imposed strict 
+        regulations or outright bans, citing concerns about financial stability, criminal activity, and environmental 
+        impact due to energy-intensive mining operations. The rise of decentralized finance (DeFi) platforms 
+        promises to democratize access to financial services but also introduces new risks and regulatory challenges.
+    """
+}
+
+
+# Whitespace-collapsed once at import rather than on every lookup
+_TOPIC_TEXTS = {key: _WS_RE.sub(' ', text).strip() for key, text in _RAW_TOPIC_TEXTS.items()}
+
+
+# JSON document fields, in priority order, for each slot of a processed document
+_FIELD_PRIORITIES = {
+    'title': ('title', 'headline', 'subject', 'name'),
+    'abstract': ('abstract', 'summary', 'description', 'snippet'),
+    'body_text': ('body', 'text', 'content', 'article', 'message'),
+    'references': ('references', 'citations', 'sources'),
+}
+
+# Lowercase field name -> (slot, priority) for single-pass lookup
+_FIELD_MAP = {
+    field: (slot, priority)
+    for slot, fields in _FIELD_PRIORITIES.items()
+    for priority, field in enumerate(fields)
+}
+
+
+def _collect_strings(obj, out, limit=10000):
+    """
+    Collect string leaves from nested JSON data, depth first
+    
+    Parameters:
+        obj: Parsed JSON value (dict, list, str, ...)
+        out: List that strings are appended to
+        limit: Maximum number of strings to collect
+    
+    Returns:
+        The output list
+    """
+    if len(out) >= limit:
+        return out
+    
+    if isinstance(obj, str):
+        if obj:
+            out.append(obj)
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            _collect_strings(value, out, limit)
+    elif isinstance(obj, list):
+        for value in obj:
+            _collect_strings(value, out, limit)
+    
+    return out
+
+
+@lru_cache(maxsize=32)
+def _load_stopwords(language):
+    """
+    Load the stopword set for a language once per process
+    
+    Parameters:
+        language: NLTK stopwords language name
+    
+    Returns:
+        Frozen set of stopwords (English if the language is unavailable)
+    """
+    try:
+        return frozenset(stopwords.words(language))
+    except (LookupError, OSError):
+        logger.warning(f"Stopwords not available for language: {language}. Using English.")
+        return frozenset(stopwords.words('english'))
+
+
+# clean_text + word tokenization in one pass: URLs and email addresses match
+# without capturing, so findall yields '' for them and the word otherwise
+_CLEAN_WORD_RE = re.compile(r'https?://\S+|www\.\S+|\S+@\S+|([^\W\d_]+)')
+
+
+def _tokenize_nostop(text, stop_words):
+    """
+    Lowercase, strip URLs/emails, tokenize and drop stopwords in a single scan
+    
+    Equivalent to tokenizing clean_text(text) and filtering stopwords for
+    ordinary text. They differ when a URL or email address is glued to the
+    letters before it ("seewww.example.com", "xhttp://foo"): clean_text
+    finds the URL mid-word and drops it, while this scan reads the leading
+    letters as one word and then tokenizes the rest of the URL.
+
+    Parameters:
+        text: Raw text
+        stop_words: Set of lowercase stopwords
+    
+    Returns:
+        List of lowercase non-stopword tokens
+    """
+    return [word for word in _CLEAN_WORD_RE.findall(text.lower()) if word and word not in stop_words]
+
+
+def _word_tokenize(text):
+    """Split text into word tokens (letters only, punctuation dropped)"""
+    return _WORD_RE.findall(text)
+
+
+def _sent_tokenize(text):
+    """Split text into sentences on terminal punctuation"""
+    return [s for s in _SENT_SPLIT_RE.split(text) if s]
+
+
 # Download required NLTK data
 try:
     nltk.data.find('tokenizers/punkt')
@@ -36,19 +220,42 @@ except LookupError:
 class TextProcessor:
     """Text processing class for cleaning and analyzing text"""
     
-    def __init__(self, language='english'):
+    def __init__(self, language='english', use_nltk=False):
         """
         Initialize text processor
         
         Parameters:
             language: Language for stopwords and processing (default: english)
+            use_nltk: Tokenize with NLTK's word/sentence tokenizers instead of
+                      the faster regex tokenizers
         """
         self.language = language
-        try:
-            self.stop_words = set(stopwords.words(language))
-        except:
-            logger.warning(f"Stopwords not available for language: {language}. Using English.")
-            self.stop_words = set(stopwords.words('english'))
+        self.use_nltk = use_nltk
+        self.stop_words = _load_stopwords(language)
+        
+        # TF-IDF model of the corpus passed to fit_corpus
+        self._tfidf = None
+        self._tfidf_matrix = None
+        
+        # Word sets of processed documents, keyed by their full text. Kept
+        # here rather than in the result dictionaries so those stay JSON-serializable
+        self._word_sets = LRUCache(maxsize=WORD_SET_CACHE_SIZE)
+    
+    def _words(self, text):
+        """Tokenize text into words (no punctuation tokens) with the configured tokenizer"""
+        if self.use_nltk:
+            return [word for word in word_tokenize(text) if word.isalpha()]
+        return _word_tokenize(text)
+    
+    def _sentences(self, text):
+        """Tokenize text into sentences with the configured tokenizer"""
+        return sent_tokenize(text) if self.use_nltk else _sent_tokenize(text)
+    
+    def _clean_words(self, text):
+        """Tokenize clean_text(text) into words, in a single scan on the regex path"""
+        if self.use_nltk:
+            return self._words(self.clean_text(text))
+        return [word for word in _CLEAN_WORD_RE.findall(text.lower()) if word]
     
     def clean_text(self, text):
         """
@@ -63,20 +270,11 @@ class TextProcessor:
         if not text:
             return ""
         
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove URLs
-        text = re.sub(r'https?://\S+|www\.\S+', ' ', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', ' ', text)
-        
-        # Remove special characters but keep punctuation for sentence splitting
-        text = re.sub(r'[^\w\s.,!?]', ' ', text)
+        # Lowercase, then remove URLs, email addresses and special characters
+        text = _STRIP_RE.sub(' ', text.lower())
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WS_RE.sub(' ', text).strip()
         
         return text
     
@@ -93,7 +291,7 @@ class TextProcessor:
         if not text:
             return ""
         
-        words = word_tokenize(text)
+        words = self._words(text)
         filtered_words = [word for word in words if word.lower() not in self.stop_words]
         return ' '.join(filtered_words)
     
@@ -108,15 +306,13 @@ class TextProcessor:
         Returns:
             List of (word, frequency) tuples
         """
-        # Preprocess text
-        cleaned_text = self.clean_text(text)
-        
-        # Tokenize
-        words = word_tokenize(cleaned_text)
-        
-        # Remove stopwords
-        stop_words = set(stopwords.words(self.language))
-        filtered_words = [word.lower() for word in words if word.isalpha() and word.lower() not in stop_words]
+        if self.use_nltk:
+            # Preprocess, tokenize and remove stopwords (clean_text already lowercased)
+            words = self._words(self.clean_text(text))
+            filtered_words = [word for word in words if word not in self.stop_words]
+        else:
+            # Same pipeline fused into one regex scan
+            filtered_words = _tokenize_nostop(text or "", self.stop_words)
         
         # Count word frequencies
         word_freq = Counter(filtered_words)
@@ -138,7 +334,7 @@ class TextProcessor:
             return []
         
         # Split text into sentences
-        sentences = sent_tokenize(text)
+        sentences = self._sentences(text)
         
         # Clean sentences
         cleaned_sentences = [s.strip() for s in sentences if s.strip()]
@@ -166,22 +362,27 @@ class TextProcessor:
         if len(sentences) <= num_sentences:
             return text
         
-        # Calculate word frequency
-        cleaned_text = self.clean_text(text)
-        word_freq = Counter(word_tokenize(cleaned_text))
+        if num_sentences <= 0:
+            return ""
+        
+        # Imported here: scikit-learn drags in SciPy and joblib at import time
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        # Build a sparse sentence-by-term count matrix
+        vectorizer = CountVectorizer(token_pattern=_WORD_RE.pattern, stop_words=list(self.stop_words))
+        try:
+            counts = vectorizer.fit_transform(sentences)
+        except ValueError:
+            # Every sentence was empty or made up only of stopwords
+            return ""
         
-        # Score sentences based on word frequency
-        sentence_scores = {}
-        for i, sentence in enumerate(sentences):
-            for word in word_tokenize(sentence.lower()):
-                if word in word_freq:
-                    if i not in sentence_scores:
-                        sentence_scores[i] = 0
-                    sentence_scores[i] += word_freq[word]
+        # Score each sentence by the document frequency of the words it contains
+        word_freq = np.asarray(counts.sum(axis=0)).ravel()
+        sentence_scores = counts @ word_freq
         
-        # Get top N sentences
-        top_sentence_indices = sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:num_sentences]
-        top_sentence_indices = sorted(top_sentence_indices)  # Sort by position in text
+        # Get top N sentences, skipping ones that share no words with the document
+        top = np.argpartition(-sentence_scores, num_sentences - 1)[:num_sentences]
+        top_sentence_indices = sorted(i for i in top.tolist() if sentence_scores[i] > 0)  # Sort by position in text
         
         # Create summary
         summary = ' '.join([sentences[i] for i in top_sentence_indices])
@@ -208,10 +409,7 @@ class TextProcessor:
         
         # Extract sentences and words
         sentences = self.extract_sentences(text)
-        words = word_tokenize(text)
-        
-        # Filter out punctuation
-        words = [word for word in words if word.isalpha()]
+        words = self._words(text)
         
         # Calculate metrics
         sentence_count = len(sentences)
@@ -220,8 +418,9 @@ class TextProcessor:
         # Average sentence length (in words)
         avg_sentence_length = word_count / sentence_count if sentence_count > 0 else 0
         
-        # Average word length
-        avg_word_length = sum(len(word) for word in words) / word_count if word_count > 0 else 0
+        # Average word length, computed over an int array rather than per word
+        lengths = np.fromiter(map(len, words), dtype=np.int32, count=word_count)
+        avg_word_length = float(lengths.mean()) if lengths.size else 0
         
         return {
             'sentence_count': sentence_count,
@@ -230,6 +429,50 @@ class TextProcessor:
             'avg_word_length': avg_word_length
         }
     
+    def _word_set(self, text):
+        """
+        Get the set of cleaned words in a text, as used for topic overlap scoring
+        
+        Parameters:
+            text: Text to tokenize
+        
+        Returns:
+            Frozen set of words
+        """
+        return frozenset(self._clean_words(text))
+    
+    def _document_word_set(self, text):
+        """
+        Get the word set of a document's full text, from the cache when it was
+        already computed by process_* or an earlier scoring call
+        
+        Parameters:
+            text: Full text of the document
+        
+        Returns:
+            Frozen set of words
+        """
+        word_set = self._word_sets.get(text)
+        if word_set is None:
+            word_set = self._word_set(text)
+            self._word_sets.set(text, word_set)
+        return word_set
+    
+    def _cache_word_set(self, result):
+        """
+        Precompute the word set of a processed document so topic scoring
+        doesn't have to re-tokenize it
+        
+        Parameters:
+            result: Processed text content dictionary (or None)
+        
+        Returns:
+            The same dictionary, unchanged
+        """
+        if result is not None:
+            self._document_word_set(result.get('full_text', ''))
+        return result
+    
     def process_text_file(self, file_path):
         """
         Process plain text file
@@ -243,21 +486,31 @@ class TextProcessor:
         logger.info(f"Processing text file: {file_path}")
         
         try:
-            # Check if file exists
-            if not os.path.exists(file_path):
-                logger.error(f"File does not exist: {file_path}")
-                return None
-            
-            # Read file content
+            # Stream the file and split it into paragraphs as it is read, so the
+            # raw file never has to be held in memory alongside the paragraphs
+            paragraphs = []
+            # Text read since the last paragraph break, joined only once the
+            # next break arrives, so a file without blank lines stays linear
+            pending = []
             with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+                for chunk in iter(lambda: f.read(TEXT_READ_CHUNK_SIZE), ''):
+                    # Only the new chunk is searched, plus one carried character
+                    # for a break split across two reads
+                    carry = pending[-1][-1:] if pending else ''
+                    found = (carry + chunk).rfind('\n\n')
+                    pending.append(chunk)
+                    if found == -1:
+                        continue
+                    
+                    text = ''.join(pending)
+                    end = len(text) - len(chunk) - len(carry) + found
+                    paragraphs.extend(p.strip() for p in text[:end].split('\n\n') if p.strip())
+                    pending = [text[end + 2:]]
+            paragraphs.extend(p.strip() for p in ''.join(pending).split('\n\n') if p.strip())
             
             # Use filename as title
             title = Path(file_path).stem
             
-            # Split content into paragraphs
-            paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-            
             # If there are paragraphs, the first one might be an abstract
             abstract = paragraphs[0] if paragraphs else ""
             
@@ -269,14 +522,18 @@ class TextProcessor:
                 body_text = abstract
                 abstract = ""
             
-            return {
+            return self._cache_word_set({
                 'title': title,
                 'abstract': abstract,
                 'body_text': body_text,
-                'full_text': content,
+                'full_text': '\n\n'.join(paragraphs),
                 'references': []
-            }
+            })
             
+        except FileNotFoundError:
+            # Opening directly instead of checking first avoids a stat per call and the race
+            logger.error(f"File does not exist: {file_path}")
+            return None
         except Exception as e:
             logger.error(f"Error processing text file: {e}")
             return None
@@ -294,11 +551,6 @@ class TextProcessor:
         logger.info(f"Processing JSON file: {file_path}")
         
         try:
-            # Check if file exists
-            if not os.path.exists(file_path):
-                logger.error(f"File does not exist: {file_path}")
-                return None
-            
             # Read JSON content
             with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                 data = json.load(f)
@@ -306,14 +558,17 @@ class TextProcessor:
             # Process different types of JSON structures
             if isinstance(data, list):
                 # If it's a list, it might be multiple social media posts
-                return self._process_social_media_posts(data)
+                return self._cache_word_set(self._process_social_media_posts(data))
             elif isinstance(data, dict):
                 # If it's a dictionary, it might be a single document or specific format
-                return self._process_json_document(data)
+                return self._cache_word_set(self._process_json_document(data))
             else:
                 logger.error(f"Unsupported JSON format: {type(data)}")
                 return None
             
+        except FileNotFoundError:
+            logger.error(f"File does not exist: {file_path}")
+            return None
         except Exception as e:
             logger.error(f"Error processing JSON file: {e}")
             return None
@@ -349,9 +604,9 @@ class TextProcessor:
                         text = post[field]
                         break
                 
-                # If no text found, try using the entire post
+                # If no text found, use all the string values in the post
                 if not text:
-                    text = json.dumps(post, ensure_ascii=False)
+                    text = ' '.join(_collect_strings(post, []))
             elif isinstance(post, str):
                 text = post
             
@@ -388,36 +643,26 @@ class TextProcessor:
         Returns:
             Processed text content dictionary
         """
-        # Try to extract information from common fields
-        title = ""
-        abstract = ""
-        body_text = ""
-        references = []
-        
-        # Extract title
-        for field in ['title', 'headline', 'subject', 'name']:
-            if field in document and document[field]:
-                title = document[field]
-                break
-        
-        # Extract abstract
-        for field in ['abstract', 'summary', 'description', 'snippet']:
-            if field in document and document[field]:
-                abstract = document[field]
-                break
-        
-        # Extract body text
-        for field in ['body', 'text', 'content', 'article', 'message']:
-            if field in document and document[field]:
-                body_text = document[field]
-                break
-        
-        # Extract references
-        for field in ['references', 'citations', 'sources']:
-            if field in document and document[field]:
-                if isinstance(document[field], list):
-                    references = document[field]
-                break
+        # Extract information from common fields in one pass over the
+        # document's keys, keeping the highest-priority field for each slot
+        found = {}
+        for key, value in document.items():
+            entry = _FIELD_MAP.get(key.lower()) if isinstance(key, str) else None
+            if entry is None or not value:
+                continue
+            
+            slot, priority = entry
+            if slot not in found or priority < found[slot][0]:
+                found[slot] = (priority, value)
+        
+        title = found['title'][1] if 'title' in found else ""
+        abstract = found['abstract'][1] if 'abstract' in found else ""
+        body_text = found['body_text'][1] if 'body_text' in found else ""
+        
+        # References are only used when the chosen field is a list
+        references = found['references'][1] if 'references' in found else []
+        if not isinstance(references, list):
+            references = []
         
         # If no content found, use the entire document
         if not (title or abstract or body_text):
@@ -458,27 +703,23 @@ class TextProcessor:
         try:
             import pandas as pd
             
-            # Check if file exists
-            if not os.path.exists(file_path):
-                logger.error(f"File does not exist: {file_path}")
-                return None
-            
-            # Read CSV file
-            df = pd.read_csv(file_path)
+            # Read a small sample first so the columns can be chosen before
+            # parsing the whole file
+            sample = pd.read_csv(file_path, nrows=CSV_SAMPLE_ROWS)
             
             # If text column not specified, try to guess
             if text_column is None:
                 # Common text column names
                 text_columns = ['text', 'content', 'message', 'body', 'description']
                 for col in text_columns:
-                    if col in df.columns:
+                    if col in sample.columns:
                         text_column = col
                         break
                 
                 # If still not found, use the longest string column
                 if text_column is None:
-                    for col in df.columns:
-                        if df[col].dtype == 'object':
+                    for col in sample.columns:
+                        if sample[col].dtype == 'object':
                             text_column = col
                             break
             
@@ -487,16 +728,29 @@ class TextProcessor:
                 # Common title column names
                 title_columns = ['title', 'headline', 'subject', 'name']
                 for col in title_columns:
-                    if col in df.columns:
+                    if col in sample.columns:
                         title_column = col
                         break
             
+            # Read CSV file, parsing only the text/title columns when a text column is known
+            if text_column is not None and text_column in sample.columns:
+                usecols = [col for col in dict.fromkeys((text_column, title_column))
+                           if col is not None and col in sample.columns]
+                df = pd.read_csv(file_path, usecols=usecols, dtype='string', engine='c')
+            else:
+                df = pd.read_csv(file_path)
+            
             # Extract text content
             if text_column is not None and text_column in df.columns:
                 texts = df[text_column].dropna().astype(str).tolist()
             else:
-                # If no text column found, use all columns
-                texts = df.apply(lambda row: ' '.join(row.astype(str)), axis=1).tolist()
+                # If no text column found, use all columns, concatenated a whole
+                # column at a time rather than row by row
+                columns = [df[col].astype(str) for col in df.columns]
+                joined = columns[0] if columns else pd.Series([], dtype=str)
+                for column in columns[1:]:
+                    joined = joined + ' ' + column
+                texts = joined.tolist()
             
             # Extract title
             if title_column is not None and title_column in df.columns:
@@ -514,14 +768,17 @@ class TextProcessor:
             # Rest of rows as body text
             body_text = '\n\n'.join(texts[1:]) if len(texts) > 1 else ""
             
-            return {
+            return self._cache_word_set({
                 'title': title,
                 'abstract': abstract,
                 'body_text': body_text,
                 'full_text': combined_text,
                 'references': []
-            }
+            })
             
+        except FileNotFoundError:
+            logger.error(f"File does not exist: {file_path}")
+            return None
         except Exception as e:
             logger.error(f"Error processing CSV file: {e}")
             return None
@@ -551,6 +808,35 @@ class TextProcessor:
             # Try processing as text file
             return self.process_text_file(file_path)
     
+    def process_files(self, file_paths, n_process=None):
+        """
+        Process many files in parallel across worker processes
+        
+        Parameters:
+            file_paths: List of file paths
+            n_process: Number of worker processes (default: CPU count)
+        
+        Returns:
+            List of processed text content dictionaries, in input order
+            (None for files that failed)
+        """
+        file_paths = list(file_paths)
+        if not file_paths:
+            return []
+        
+        n_process = n_process or os.cpu_count() or 1
+        
+        # Files are independent, so only fork when there is more than one
+        if n_process == 1 or len(file_paths) == 1:
+            return [self.process_file(path) for path in file_paths]
+        
+        # A few chunks per worker keeps workers busy without per-file IPC overhead
+        chunksize = max(1, len(file_paths) // (4 * n_process))
+        logger.info(f"Processing {len(file_paths)} files with {n_process} processes")
+        
+        with ProcessPoolExecutor(max_workers=n_process) as executor:
+            return list(executor.map(self.process_file, file_paths, chunksize=chunksize))
+    
     def generate_topic_text(self, topic):
         """
         Generate text content related to a specific topic
@@ -566,69 +852,10 @@ class TextProcessor:
         # Convert topic to lowercase for case-insensitive matching
         topic_lower = topic.lower()
         
-        # Dictionary of predefined topic texts
-        topic_texts = {
-            'ai': """
-                Artificial Intelligence (AI) is revolutionizing industries across the globe. 
-                Machine learning algorithms are becoming increasingly sophisticated, enabling computers to perform tasks 
-                that once required human intelligence. Deep learning, a subset of AI, has made significant breakthroughs 
-                in image recognition, natural language processing, and autonomous vehicles. However, concerns about AI ethics, 
-                job displacement, and privacy issues have also emerged. Some experts worry about the potential for AI to 
-                surpass human intelligence, while others see it as a tool that will enhance human capabilities. 
-                Companies like Google, Microsoft, and OpenAI are investing billions in AI research and development. 
-                The future of AI looks promising but requires careful consideration of its societal impacts.
-            """,
-            
-            'climate change': """
-                Climate change represents one of the most pressing challenges of our time. Rising global temperatures 
-                have led to melting ice caps, rising sea levels, and increasingly severe weather events. Many scientists 
-                warn that without immediate action, we face catastrophic consequences. Efforts to combat climate change 
-                include renewable energy adoption, carbon capture technologies, and international agreements like the 
-                Paris Accord. However, progress has been slow, and some countries continue to prioritize economic growth 
-                over environmental concerns. Activists like Greta Thunberg have brought global attention to the urgency 
-                of the situation, while some politicians and industry leaders remain skeptical about the severity of the 
-                problem or the need for dramatic action.
-            """,
-            
-            'healthcare': """
-                The healthcare industry is undergoing rapid transformation due to technological advancements and changing 
-                patient expectations. Telemedicine has expanded access to care, particularly in rural areas and during the 
-                COVID-19 pandemic. Electronic health records have improved information sharing among providers but have 
-                also raised concerns about data security. Precision medicine is enabling more personalized treatment plans 
-                based on genetic factors. However, healthcare costs continue to rise in many countries, creating barriers 
-                to access for vulnerable populations. The debate over universal healthcare remains contentious, with 
-                proponents citing improved outcomes and equity, while critics worry about quality of care and economic impacts. 
-                Mental health services have gained increased attention but still face stigma and funding challenges.
-            """,
-            
-            'education': """
-                Education systems worldwide are evolving to meet the demands of the 21st century. Digital learning tools 
-                and online courses have expanded access to education beyond traditional classrooms. The COVID-19 pandemic 
-                accelerated this trend, forcing schools and universities to adopt remote learning models. However, this 
-                transition highlighted the digital divide, as students without reliable internet access or appropriate 
-                devices fell behind. STEM education has received increased emphasis, reflecting the growing importance of 
-                technical skills in the job market. At the same time, there's recognition of the continued value of liberal 
-                arts education in developing critical thinking and communication skills. Issues of educational equity persist, 
-                with significant disparities in resources and outcomes based on socioeconomic status, race, and geography.
-            """,
-            
-            'cryptocurrency': """
-                Cryptocurrency has emerged as a disruptive force in the financial world. Bitcoin, the first and most 
-                well-known cryptocurrency, has experienced dramatic price fluctuations since its creation in 2009. 
-                Blockchain technology, which underlies most cryptocurrencies, offers potential benefits beyond digital 
-                currencies, including secure supply chain management and voting systems. Some countries have embraced 
-                cryptocurrency, with El Salvador even adopting Bitcoin as legal tender. Others have imposed strict 
-                regulations or outright bans, citing concerns about financial stability, criminal activity, and environmental 
-                impact due to energy-intensive mining operations. The rise of decentralized finance (DeFi) platforms 
-                promises to democratize access to financial services but also introduces new risks and regulatory challenges.
-            """
-        }
-        
         # Check if we have predefined text for this topic
-        for key, text in topic_texts.items():
+        for key, text in _TOPIC_TEXTS.items():
             if topic_lower in key or key in topic_lower:
-                # Clean up the text (remove extra whitespace)
-                return re.sub(r'\s+', ' ', text).strip()
+                return text
         
         # If no predefined text is found, generate a generic response
         return f"""
@@ -655,23 +882,16 @@ class TextProcessor:
             return []
         
         # Clean and tokenize topic
-        topic_words = set(word_tokenize(self.clean_text(topic)))
+        topic_words = self._word_set(topic)
         
         # Extract sentences
         sentences = self.extract_sentences(text)
         
-        # Score sentences based on topic relevance
-        topic_sentences = []
-        for sentence in sentences:
-            # Clean and tokenize sentence
-            sentence_words = set(word_tokenize(self.clean_text(sentence)))
-            
-            # Calculate overlap with topic words
-            overlap = len(sentence_words.intersection(topic_words))
-            
-            # If there's significant overlap, include the sentence
-            if overlap > 0:
-                topic_sentences.append(sentence)
+        # Keep sentences that share any word with the topic, stopping at the first hit
+        topic_sentences = [
+            sentence for sentence in sentences
+            if any(word in topic_words for word in self._clean_words(sentence))
+        ]
         
         return topic_sentences
     
@@ -690,8 +910,8 @@ class TextProcessor:
             return 0.0
         
         # Clean and tokenize text and topic
-        text_words = set(word_tokenize(self.clean_text(text)))
-        topic_words = set(word_tokenize(self.clean_text(topic)))
+        text_words = self._word_set(text)
+        topic_words = self._word_set(topic)
         
         # Calculate word overlap
         overlap = len(text_words.intersection(topic_words))
@@ -702,6 +922,82 @@ class TextProcessor:
         
         return min(1.0, relevance_score)  # Cap at 1.0
     
+    def score_many(self, documents, topic):
+        """
+        Calculate topic relevance for many documents against one topic
+        
+        Parameters:
+            documents: Processed document dictionaries or raw text strings
+            topic: Topic to check relevance against
+        
+        Returns:
+            List of relevance scores between 0 and 1, in input order
+        """
+        # Tokenize the topic once for the whole batch
+        topic_words = self._word_set(topic) if topic else frozenset()
+        if not topic_words:
+            return [0.0] * len(documents)
+        
+        scores = []
+        for document in documents:
+            if isinstance(document, dict):
+                word_set = self._document_word_set(document.get('full_text', ''))
+            else:
+                word_set = self._word_set(document or '')
+            
+            scores.append(min(1.0, len(word_set & topic_words) / len(topic_words)))
+        
+        return scores
+    
+    def fit_corpus(self, texts):
+        """
+        Fit a TF-IDF model over a corpus for repeated topic scoring
+        
+        Parameters:
+            texts: List of document texts
+        
+        Returns:
+            Number of documents in the fitted corpus
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        # clean_text strips apostrophes, so contracted stopwords ("don't")
+        # only match once they are split the same way ("don", "t")
+        stop_words = sorted({
+            token
+            for word in self.stop_words
+            for token in _WORD_RE.findall(self.clean_text(word))
+        })
+        
+        vectorizer = TfidfVectorizer(
+            preprocessor=self.clean_text,
+            token_pattern=_WORD_RE.pattern,
+            stop_words=stop_words
+        )
+        self._tfidf_matrix = vectorizer.fit_transform(texts)
+        self._tfidf = vectorizer
+        
+        logger.info(f"Fitted TF-IDF model on {self._tfidf_matrix.shape[0]} documents")
+        return self._tfidf_matrix.shape[0]
+    
+    def score_topic(self, topic):
+        """
+        Score every document in the fitted corpus against a topic
+        
+        Parameters:
+            topic: Topic to check relevance against
+        
+        Returns:
+            NumPy array of TF-IDF cosine similarities, one per corpus document
+        """
+        if self._tfidf is None:
+            raise ValueError("fit_corpus must be called before score_topic")
+        
+        from sklearn.metrics.pairwise import cosine_similarity
+        
+        topic_vector = self._tfidf.transform([topic])
+        return cosine_similarity(topic_vector, self._tfidf_matrix)[0]
+    
     def extract_topic_keywords(self, text, topic, top_n=10):
         """
         Extract keywords that are relevant to the given topic
@@ -718,7 +1014,7 @@ class TextProcessor:
             return []
         
         # Clean and tokenize topic
-        topic_words = set(word_tokenize(self.clean_text(topic)))
+        topic_words = self._word_set(topic)
         
         # Extract topic-relevant sentences
         topic_sentences = self.extract_topic_sentences(text, topic)
@@ -733,8 +1029,9 @@ class TextProcessor:
             topic_related = []
             other_keywords = []
             
+            # Keywords come back lowercase from extract_keywords
             for word, count in all_keywords:
-                if word.lower() in topic_words or any(topic_word in word.lower() for topic_word in topic_words):
+                if word in topic_words or any(topic_word in word for topic_word in topic_words):
                     topic_related.append((word, count))
                 else:
                     other_keywords.append((word, count))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Upload Registry Module
+SQLite record of ingested files by content hash, so duplicate uploads skip re-processing
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+from contextlib import closing
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UploadRegistry:
+    """Maps the SHA-256 of each ingested file to its paper and upload result"""
+
+    def __init__(self, db_path: str = "./upload_registry.db"):
+        """
+        Initialize upload registry
+
+        Parameters:
+            db_path: Path to the SQLite registry file
+        """
+        self.db_path = db_path
+
+        registry_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(registry_dir, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS uploads (
+                    sha256 TEXT PRIMARY KEY,
+                    paper_id TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_uploads_paper_id ON uploads(paper_id)")
+
+        logger.info(f"Initialized upload registry at: {db_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection (one per operation, so it is safe across Flask threads)"""
+        return sqlite3.connect(self.db_path, timeout=5.0)
+
+    def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a previously ingested file
+
+        Parameters:
+            sha256: Hex digest of the file contents
+
+        Returns:
+            Upload result recorded for the file, or None if it hasn't been ingested
+        """
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT result FROM uploads WHERE sha256 = ?", (sha256,)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            logger.warning(f"Error reading upload registry: {e}")
+            return None
+
+    def add(self, sha256: str, result: Dict[str, Any]) -> None:
+        """
+        Record an ingested file
+
+        Parameters:
+            sha256: Hex digest of the file contents
+            result: Upload result, including its paper_id
+        """
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO uploads (sha256, paper_id, result, created_at) VALUES (?, ?, ?, ?)",
+                    (sha256, result['paper_id'], json.dumps(result), time.time())
+                )
+        except Exception as e:
+            logger.warning(f"Error writing upload registry: {e}")
+
+    def remove_paper(self, paper_id: str) -> None:
+        """
+        Forget the file(s) a deleted paper was ingested from, so they can be uploaded again
+
+        Parameters:
+            paper_id: Paper ID that was deleted
+        """
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM uploads WHERE paper_id = ?", (paper_id,))
+        except Exception as e:
+            logger.warning(f"Error updating upload registry: {e}")
@@ -7,47 +7,373 @@ Manages ChromaDB for storing and retrieving document embeddings
 """
 
 import os
+import json
+import sqlite3
+import hashlib
 import logging
-import chromadb
-from chromadb.config import Settings
+import threading
+from contextlib import closing
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+
+from pq_index import PQIndex, PQ_MIN_TRAIN_SIZE
+from memory_cache import LRUCache
+from pca_projector import PCAProjector, PCA_MIN_TRAIN_SIZE
+
 logger = logging.getLogger(__name__)
 
+# Chunks live in the base collection until a PCA projection is fitted,
+# then move to a collection of reduced vectors
+COLLECTION_NAME = "academic_papers"
+PCA_COLLECTION_NAME = "academic_papers_pca"
+
+# Retrieval results kept in memory, keyed by query embedding and filter
+QUERY_CACHE_SIZE = 1024
+
+# Partial index so a paper's chunks can be found without scanning every
+# metadata row; covers (paper_id value -> embedding row id)
+_PAPER_ID_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_embedding_metadata_paper_id
+    ON embedding_metadata (string_value, id) WHERE key = 'paper_id'
+"""
+
+# Chunk IDs of one paper within one collection, in insertion order.
+# CROSS JOIN pins the metadata table as the outer loop, so SQLite drives
+# the lookup from the paper_id index rather than scanning embeddings
+_PAPER_CHUNK_IDS_SQL = """
+    SELECT e.embedding_id
+    FROM embedding_metadata pm
+    CROSS JOIN embeddings e ON e.id = pm.id
+    JOIN segments s ON s.id = e.segment_id
+    WHERE pm.key = 'paper_id' AND pm.string_value = ? AND s.collection = ?
+    ORDER BY e.id
+"""
+
+# One row per paper, built from the metadata of its first stored chunk.
+# Chroma keeps metadata as (id, key, value) rows, so the paper-level
+# fields are pivoted back into columns here. Pages are cut before the
+# pivot (LIMIT -1 means no limit).
+_LIST_PAPERS_SQL = """
+    WITH firsts AS (
+        SELECT MIN(pm.id) AS id, pm.string_value AS paper_id
+        FROM embedding_metadata pm
+        JOIN embeddings e ON e.id = pm.id
+        JOIN segments s ON s.id = e.segment_id
+        WHERE s.collection = ? AND pm.key = 'paper_id' AND pm.string_value IS NOT NULL
+        GROUP BY pm.string_value
+        ORDER BY MIN(pm.id)
+        LIMIT ? OFFSET ?
+    )
+    SELECT
+        f.paper_id,
+        MAX(CASE WHEN m.key = 'title' THEN COALESCE(m.string_value, m.int_value, m.float_value) END),
+        MAX(CASE WHEN m.key = 'authors' THEN COALESCE(m.string_value, m.int_value, m.float_value) END),
+        MAX(CASE WHEN m.key = 'year' THEN COALESCE(m.string_value, m.int_value, m.float_value) END),
+        MAX(CASE WHEN m.key = 'upload_date' THEN COALESCE(m.string_value, m.int_value, m.float_value) END)
+    FROM firsts f
+    LEFT JOIN embedding_metadata m
+        ON m.id = f.id AND m.key IN ('title', 'authors', 'year', 'upload_date')
+    GROUP BY f.id
+    ORDER BY f.id
+"""
+
+# Distinct papers in a collection, answered from the paper_id index
+_COUNT_PAPERS_SQL = """
+    SELECT COUNT(DISTINCT pm.string_value)
+    FROM embedding_metadata pm
+    CROSS JOIN embeddings e ON e.id = pm.id
+    JOIN segments s ON s.id = e.segment_id
+    WHERE pm.key = 'paper_id' AND s.collection = ?
+"""
+
+# HNSW settings for the paper collection. Chroma fixes these when a collection
+# is created, so they only take effect for new (or reset) stores.
+COLLECTION_METADATA = {
+    "description": "Academic paper chunks with embeddings",
+    # Vectors are unit-normalized on the way in, so inner product is cosine
+    "hnsw:space": "ip",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200
+}
+
+
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length, so inner product equals cosine similarity"""
+    return vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-9)
+
 
 class VectorStore:
     """Manages vector database operations using ChromaDB"""
     
-    def __init__(self, persist_directory: str = "./chroma_db"):
+    def __init__(
+        self,
+        persist_directory: str = "./chroma_db",
+        use_pq: bool = False,
+        use_pca: bool = False,
+        auto_maintenance: bool = True
+    ):
         """
         Initialize ChromaDB vector store
         
         Parameters:
             persist_directory: Directory to persist the vector database
+            use_pq: Serve unfiltered queries from an in-memory PQ index once trained
+            use_pca: Reduce stored vectors with PCA once enough chunks are stored
+            auto_maintenance: Run index maintenance (PCA fitting, PQ training and
+                              saving) in a background thread after writes; if
+                              False, call run_maintenance() explicitly
         """
         self.persist_directory = persist_directory
         os.makedirs(persist_directory, exist_ok=True)
         
+        # Imported lazily: chromadb pulls in onnxruntime, grpc and friends
+        import chromadb
+        from chromadb.config import Settings
+        
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(
             path=persist_directory,
             settings=Settings(
                 anonymized_telemetry=False,
-                allow_reset=True
+                # reset() drops just our collection; nothing needs client.reset()
+                allow_reset=False
+            )
+        )
+        
+        # Optional PCA projection; once fitted, the store lives in the reduced collection
+        self.pca = PCAProjector(os.path.join(persist_directory, "pca.npz")) if use_pca else None
+        
+        # Get or create collection. get_or_create_collection is only used for the
+        # create path: given metadata, it overwrites an existing collection's,
+        # including the HNSW space its persisted index was built with
+        projector = self.pca if self.pca is not None and self.pca.is_fitted else None
+        collection_name = PCA_COLLECTION_NAME if projector is not None else COLLECTION_NAME
+        try:
+            collection = self.client.get_collection(name=collection_name)
+            logger.info(f"Loaded existing collection: {collection_name}")
+        except ValueError:
+            # Unlike create_collection, doesn't fail if another worker created it meanwhile
+            collection = self.client.get_or_create_collection(
+                name=collection_name,
+                metadata=COLLECTION_METADATA
+            )
+            logger.info(f"Created new collection: {collection_name}")
+        
+        # (collection, fitted PCA projector or None), read together by every
+        # operation and replaced in one assignment when a PCA migration finishes
+        self._active = (collection, projector)
+        
+        # Optional PQ tier: compact codes scanned in memory instead of walking HNSW
+        self.pq_index = PQIndex(os.path.join(persist_directory, "pq_index")) if use_pq else None
+        
+        self._ensure_paper_id_index()
+        
+        # Bumped on every write; part of each cache key, so results cached
+        # before a write are never served after it
+        self._generation = 0
+        self._query_cache = LRUCache(maxsize=QUERY_CACHE_SIZE)
+        
+        # Chunk and paper counts as (generation, value), recomputed only after a write
+        self._counts = {}
+        
+        # Serializes writes to the collection and PQ index, including the final
+        # catch-up steps of background maintenance
+        self._write_lock = threading.RLock()
+        
+        # At most one maintenance thread (PCA fitting, PQ training and saving);
+        # writes while it runs ask for another pass
+        self.auto_maintenance = auto_maintenance
+        self._maintenance_lock = threading.Lock()
+        self._maintenance_thread = None
+        self._maintenance_pending = False
+        # PQ codes saved before a crash may miss the last writes; reconciled once per process
+        self._pq_synced = False
+        
+        # Chroma loads the HNSW index on the first query; do that now, off the
+        # startup path, so the first user query doesn't pay for it
+        threading.Thread(target=self.warmup, name="vector-store-warmup", daemon=True).start()
+        
+        self._schedule_maintenance()
+    
+    @property
+    def collection(self):
+        """The Chroma collection currently holding the chunks"""
+        return self._active[0]
+    
+    @property
+    def collection_name(self) -> str:
+        """Name of the collection currently holding the chunks"""
+        return self._active[0].name
+    
+    def warmup(self) -> None:
+        """Load the collection's HNSW index into memory by running one query"""
+        try:
+            sample = self.collection.get(limit=1, include=['embeddings'])
+            if not sample['ids']:
+                return
+            
+            self.collection.query(query_embeddings=[sample['embeddings'][0]], n_results=1)
+            logger.info(f"Warmed up collection: {self.collection_name}")
+        except Exception as e:
+            logger.warning(f"Vector store warmup failed: {e}")
+    
+    @staticmethod
+    def _project(vectors: np.ndarray, projector: Optional[PCAProjector]) -> np.ndarray:
+        """Apply a fitted PCA projection, if any, keeping vectors unit length"""
+        if projector is None:
+            return vectors
+        return _l2_normalize(projector.transform(vectors))
+    
+    def _add_batches(self, collection, documents, vectors, metadatas, ids) -> None:
+        """Add chunks to a collection, split only where Chroma's batch limit forces it"""
+        # Chroma 0.4 only accepts embeddings as lists, so convert per sub-batch
+        batch_size = getattr(self.client, 'max_batch_size', None) or len(documents)
+        for start in range(0, len(documents), batch_size):
+            end = start + batch_size
+            collection.add(
+                documents=documents[start:end],
+                embeddings=vectors[start:end].tolist(),
+                metadatas=metadatas[start:end],
+                ids=ids[start:end]
             )
+    
+    def _maybe_fit_pca(self) -> None:
+        """Once enough chunks are stored, fit PCA and move every chunk to a reduced collection"""
+        source, projector = self._active
+        if self.pca is None or projector is not None:
+            return
+        if source.count() < PCA_MIN_TRAIN_SIZE:
+            return
+        
+        # Fitted and copied from a snapshot without blocking writes or queries,
+        # which keep using the full-size collection until the swap below
+        logger.info("Fitting PCA projection from stored embeddings...")
+        stored = source.get(include=['embeddings', 'documents', 'metadatas'])
+        vectors = np.asarray(stored['embeddings'], dtype=np.float32)
+        fitted = PCAProjector(self.pca.path, self.pca.n_components)
+        if not fitted.fit(vectors):
+            return
+        
+        # Leftover from a migration that was interrupted before pca.npz was saved
+        try:
+            self.client.delete_collection(name=PCA_COLLECTION_NAME)
+        except ValueError:
+            pass
+        
+        reduced = self.client.create_collection(name=PCA_COLLECTION_NAME, metadata=COLLECTION_METADATA)
+        self._add_batches(
+            reduced, stored['documents'], self._project(vectors, fitted), stored['metadatas'], stored['ids']
         )
         
-        # Get or create collection
-        self.collection_name = "academic_papers"
+        with self._write_lock:
+            if self._active[0] is not source:
+                # Reset while fitting; the snapshot is gone
+                self.client.delete_collection(name=PCA_COLLECTION_NAME)
+                return
+            
+            # Catch up with chunks added or deleted since the snapshot
+            snapshot_ids = set(stored['ids'])
+            current_ids = source.get(include=[])['ids']
+            added = [chunk_id for chunk_id in current_ids if chunk_id not in snapshot_ids]
+            deleted = snapshot_ids.difference(current_ids)
+            if added:
+                new = source.get(ids=added, include=['embeddings', 'documents', 'metadatas'])
+                self._add_batches(
+                    reduced, new['documents'],
+                    self._project(np.asarray(new['embeddings'], dtype=np.float32), fitted),
+                    new['metadatas'], new['ids']
+                )
+            if deleted:
+                reduced.delete(ids=list(deleted))
+            
+            # Persist the projection before dropping the full-size collection, so a
+            # crash in between leaves a complete store either way
+            fitted.save()
+            self.pca = fitted
+            self._active = (reduced, fitted)
+            self._generation += 1
+            
+            # PQ codes were trained on the full-size vectors
+            if self.pq_index is not None:
+                self.pq_index.reset()
+            
+            self.client.delete_collection(name=source.name)
+        
+        logger.info(
+            f"Moved {len(current_ids)} chunks to {fitted.n_components}-dimensional collection "
+            f"({len(added)} added and {len(deleted)} deleted during the migration)"
+        )
+    
+    def _maybe_train_pq(self) -> None:
+        """Train the PQ index from every stored embedding once the store is large enough"""
+        if self.pq_index is None or self.pq_index.is_trained:
+            return
+        if self.collection.count() < PQ_MIN_TRAIN_SIZE:
+            return
+        
+        # Trained from a snapshot without blocking writes; _sync_pq then picks
+        # up whatever was added or deleted meanwhile
+        logger.info("Training PQ index from stored embeddings...")
+        stored = self.collection.get(include=['embeddings'])
+        if self.pq_index.train(stored['ids'], stored['embeddings']):
+            self._sync_pq()
+    
+    def _sync_pq(self) -> None:
+        """Bring the PQ codes in line with the chunks currently in the collection"""
+        with self._write_lock:
+            stored_ids = self.collection.get(include=[])['ids']
+            coded = set(self.pq_index.ids.tolist())
+            
+            missing = [chunk_id for chunk_id in stored_ids if chunk_id not in coded]
+            stale = coded.difference(stored_ids)
+            
+            if missing:
+                stored = self.collection.get(ids=missing, include=['embeddings'])
+                self.pq_index.add(stored['ids'], stored['embeddings'])
+            if stale:
+                self.pq_index.remove(list(stale))
+            
+            self._pq_synced = True
+            if missing or stale:
+                logger.info(f"Synced PQ index: {len(missing)} codes added, {len(stale)} removed")
+    
+    def run_maintenance(self) -> None:
+        """Fit PCA and train the PQ index when due, reconcile PQ codes with the collection and save them"""
         try:
-            self.collection = self.client.get_collection(name=self.collection_name)
-            logger.info(f"Loaded existing collection: {self.collection_name}")
-        except:
-            self.collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={"description": "Academic paper chunks with embeddings"}
+            self._maybe_fit_pca()
+            if self.pq_index is not None:
+                if not self.pq_index.is_trained:
+                    self._maybe_train_pq()
+                elif not self._pq_synced:
+                    self._sync_pq()
+                self.pq_index.flush()
+        except Exception as e:
+            logger.error(f"Error during vector store maintenance: {e}")
+    
+    def _schedule_maintenance(self) -> None:
+        """Run maintenance in the background, coalescing requests made while it runs"""
+        if not self.auto_maintenance or (self.pq_index is None and self.pca is None):
+            return
+        
+        with self._maintenance_lock:
+            if self._maintenance_thread is not None:
+                self._maintenance_pending = True
+                return
+            self._maintenance_thread = threading.Thread(
+                target=self._maintenance_loop, name="vector-store-maintenance", daemon=True
             )
-            logger.info(f"Created new collection: {self.collection_name}")
+            self._maintenance_thread.start()
+    
+    def _maintenance_loop(self) -> None:
+        """Run maintenance until no further pass has been requested"""
+        while True:
+            self.run_maintenance()
+            with self._maintenance_lock:
+                if not self._maintenance_pending:
+                    self._maintenance_thread = None
+                    return
+                self._maintenance_pending = False
     
     def add_documents(
         self,
@@ -61,7 +387,7 @@ class VectorStore:
         
         Parameters:
             documents: List of document text chunks
-            embeddings: List of embedding vectors
+            embeddings: Embedding vectors, as a list of lists or a 2D numpy array
             metadatas: List of metadata dictionaries
             ids: List of unique IDs for each chunk
         
@@ -69,17 +395,35 @@ class VectorStore:
             True if successful
         """
         try:
-            self.collection.add(
-                documents=documents,
-                embeddings=embeddings,
-                metadatas=metadatas,
-                ids=ids
-            )
-            logger.info(f"Added {len(documents)} documents to vector store")
+            # One contiguous float32 block (no copy if the encoder already returned one);
+            # shape problems surface here, before anything has been written
+            vectors = np.asarray(embeddings, dtype=np.float32)
+            if vectors.ndim != 2 or not len(vectors) == len(documents) == len(metadatas) == len(ids):
+                raise ValueError(
+                    f"Mismatched batch: {len(documents)} documents, {len(metadatas)} metadatas, "
+                    f"{len(ids)} ids, embeddings of shape {vectors.shape}"
+                )
+            
+            with self._write_lock:
+                collection, projector = self._active
+                vectors = self._project(_l2_normalize(vectors), projector)
+                
+                # One bulk add per paper
+                self._add_batches(collection, documents, vectors, metadatas, ids)
+                logger.info(f"Added {len(documents)} documents to vector store")
+                
+                # Codes are only updated in memory here (a no-op until trained);
+                # training and saving happen in maintenance
+                if self.pq_index is not None:
+                    self.pq_index.add(ids, vectors)
             return True
         except Exception as e:
             logger.error(f"Error adding documents to vector store: {e}")
             return False
+        finally:
+            # Even a failed add may have written some sub-batches
+            self._generation += 1
+            self._schedule_maintenance()
     
     def query(
         self,
@@ -98,22 +442,156 @@ class VectorStore:
         Returns:
             Dictionary with query results including documents, metadatas, distances
         """
-        try:
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results,
-                where=where
+        return self.query_batch([query_embedding], n_results=n_results, where=where)[0]
+    
+    def query_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the vector store for several embeddings in one call
+        
+        Parameters:
+            query_embeddings: Query embedding vectors
+            n_results: Number of results to return per query
+            where: Optional metadata filter, shared by every query
+        
+        Returns:
+            One result dictionary per query embedding, in the same order
+        """
+        if not query_embeddings:
+            return []
+        
+        # Generation first: if a PCA migration swaps the collection in between,
+        # results from the new one are cached under the old generation, never
+        # the other way round
+        generation = self._generation
+        collection, projector = self._active
+        vectors = self._project(_l2_normalize(np.asarray(query_embeddings, dtype=np.float32)), projector)
+        where_key = json.dumps(where, sort_keys=True)
+        keys = [
+            (
+                hashlib.blake2b(vector.tobytes(), digest_size=16).digest(),
+                n_results,
+                where_key,
+                generation
             )
-            
-            logger.info(f"Query returned {len(results['documents'][0])} results")
-            return {
-                'documents': results['documents'][0],
-                'metadatas': results['metadatas'][0],
-                'distances': results['distances'][0],
-                'ids': results['ids'][0]
-            }
+            for vector in vectors
+        ]
+        
+        results = [self._query_cache.get(key) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if not misses:
+            logger.info(f"Served {len(keys)} queries from the query cache")
+            return results
+        
+        try:
+            try:
+                fetched = self._search_batch(collection, [vectors[i].tolist() for i in misses], n_results, where)
+            except Exception:
+                if self._active[0] is collection:
+                    raise
+                # A PCA migration or reset dropped the collection mid-query;
+                # answer from its replacement, projecting the queries again
+                logger.info("Collection was replaced during the query, retrying against the new one")
+                return self.query_batch(query_embeddings, n_results, where)
+            for i, result in zip(misses, fetched):
+                results[i] = result
+                self._query_cache.set(keys[i], result)
+            return results
         except Exception as e:
             logger.error(f"Error querying vector store: {e}")
+            return [
+                {
+                    'documents': [],
+                    'metadatas': [],
+                    'distances': [],
+                    'ids': []
+                }
+                for _ in query_embeddings
+            ]
+    
+    def _search_batch(
+        self,
+        collection,
+        query_embeddings: List[List[float]],
+        n_results: int,
+        where: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the PQ tier or Chroma, bypassing the query cache
+        
+        Parameters:
+            collection: Collection the query embeddings were projected for
+            query_embeddings: Query embedding vectors
+            n_results: Number of results to return per query
+            where: Optional metadata filter, shared by every query
+        
+        Returns:
+            One result dictionary per query embedding, in the same order
+        """
+        # Metadata filters need Chroma; the PQ tier only serves whole-store searches
+        if where is None and self.pq_index is not None and len(self.pq_index):
+            return [self.query_approximate(embedding, n_results) for embedding in query_embeddings]
+        
+        results = collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            where=where
+        )
+        
+        logger.info(
+            f"Query of {len(query_embeddings)} embeddings returned "
+            f"{sum(map(len, results['documents']))} results"
+        )
+        return [
+            {
+                'documents': results['documents'][i],
+                'metadatas': results['metadatas'][i],
+                'distances': results['distances'][i],
+                'ids': results['ids'][i]
+            }
+            for i in range(len(query_embeddings))
+        ]
+    
+    def query_approximate(self, query_embedding: List[float], n_results: int = 5) -> Dict[str, Any]:
+        """
+        Query the PQ index for similar documents, fetching their text from Chroma
+        
+        Parameters:
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+        
+        Returns:
+            Dictionary with query results including documents, metadatas, approximate distances
+        """
+        try:
+            ids, distances = self.pq_index.search(query_embedding, n_results)
+            stored = self.collection.get(ids=ids, include=['documents', 'metadatas']) if ids else {
+                'ids': [], 'documents': [], 'metadatas': []
+            }
+            by_id = {
+                chunk_id: (doc, metadata)
+                for chunk_id, doc, metadata in zip(stored['ids'], stored['documents'], stored['metadatas'])
+            }
+            
+            # Chroma returns get() results in storage order; restore rank order
+            results = {'documents': [], 'metadatas': [], 'distances': [], 'ids': []}
+            for chunk_id, distance in zip(ids, distances):
+                if chunk_id not in by_id:
+                    continue
+                doc, metadata = by_id[chunk_id]
+                results['documents'].append(doc)
+                results['metadatas'].append(metadata)
+                results['distances'].append(distance)
+                results['ids'].append(chunk_id)
+            
+            logger.info(f"Approximate query returned {len(results['documents'])} results")
+            return results
+        except Exception as e:
+            logger.error(f"Error querying PQ index: {e}")
             return {
                 'documents': [],
                 'metadatas': [],
@@ -132,25 +610,89 @@ class VectorStore:
             Dictionary with all chunks and metadata for the paper
         """
         try:
-            results = self.collection.get(
-                where={"paper_id": paper_id}
-            )
+            chunk_ids = self._paper_chunk_ids(paper_id)
+            if not chunk_ids:
+                logger.info(f"Retrieved 0 chunks for paper {paper_id}")
+                return {'documents': [], 'metadatas': [], 'ids': []}
+            
+            results = self.collection.get(ids=chunk_ids)
             logger.info(f"Retrieved {len(results['documents'])} chunks for paper {paper_id}")
             return results
         except Exception as e:
             logger.error(f"Error retrieving paper chunks: {e}")
             return {'documents': [], 'metadatas': [], 'ids': []}
     
-    def list_papers(self) -> List[Dict[str, Any]]:
+    def _connect_readonly(self) -> sqlite3.Connection:
+        """Open a read-only connection to Chroma's SQLite database"""
+        db_path = os.path.abspath(os.path.join(self.persist_directory, "chroma.sqlite3"))
+        return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=5.0)
+    
+    def _ensure_paper_id_index(self) -> None:
+        """Add the paper_id index to Chroma's metadata table if it is missing"""
+        db_path = os.path.join(self.persist_directory, "chroma.sqlite3")
+        try:
+            with closing(sqlite3.connect(db_path, timeout=5.0)) as conn, conn:
+                conn.execute(_PAPER_ID_INDEX_SQL)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not create paper_id index: {e}")
+    
+    def _paper_chunk_ids(self, paper_id: str) -> List[str]:
         """
-        List all papers in the vector store
+        Find the IDs of every chunk belonging to a paper
+        
+        Parameters:
+            paper_id: Paper ID to look up
+        
+        Returns:
+            List of chunk IDs
+        """
+        # Indexed lookup in SQLite; Chroma's where filter scans all metadata
+        try:
+            with closing(self._connect_readonly()) as conn:
+                rows = conn.execute(
+                    _PAPER_CHUNK_IDS_SQL, (paper_id, str(self.collection.id))
+                ).fetchall()
+            return [row[0] for row in rows]
+        except sqlite3.Error as e:
+            logger.warning(f"Could not look up chunks in SQLite, using a metadata filter instead: {e}")
+            return self.collection.get(where={"paper_id": paper_id}, include=[])['ids']
+    
+    def list_papers(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        List papers in the vector store, in upload order
+        
+        Parameters:
+            limit: Maximum number of papers to return (None for all)
+            offset: Number of papers to skip
         
         Returns:
             List of unique papers with their metadata
         """
+        # Aggregate inside SQLite so only one row per paper reaches Python;
+        # fall back to scanning chunk metadata if Chroma's schema differs
         try:
-            # Get all documents
-            all_docs = self.collection.get()
+            with closing(self._connect_readonly()) as conn:
+                rows = conn.execute(
+                    _LIST_PAPERS_SQL,
+                    (str(self.collection.id), limit if limit is not None else -1, offset)
+                ).fetchall()
+            
+            return [
+                {
+                    'paper_id': paper_id,
+                    'title': title if title is not None else 'Unknown',
+                    'authors': authors if authors is not None else '',
+                    'year': year if year is not None else '',
+                    'upload_date': upload_date if upload_date is not None else ''
+                }
+                for paper_id, title, authors, year, upload_date in rows
+            ]
+        except sqlite3.Error as e:
+            logger.warning(f"Could not list papers from SQLite, scanning metadata instead: {e}")
+        
+        try:
+            # Get all chunk metadata
+            all_docs = self.collection.get(include=['metadatas'])
             
             # Extract unique papers
             papers = {}
@@ -165,7 +707,8 @@ class VectorStore:
                         'upload_date': metadata.get('upload_date', '')
                     }
             
-            return list(papers.values())
+            papers = list(papers.values())[offset:]
+            return papers[:limit] if limit is not None else papers
         except Exception as e:
             logger.error(f"Error listing papers: {e}")
             return []
@@ -182,10 +725,17 @@ class VectorStore:
         """
         try:
             # Get all chunk IDs for this paper
-            results = self.collection.get(where={"paper_id": paper_id})
-            if results['ids']:
-                self.collection.delete(ids=results['ids'])
-                logger.info(f"Deleted {len(results['ids'])} chunks for paper {paper_id}")
+            with self._write_lock:
+                chunk_ids = self._paper_chunk_ids(paper_id)
+                if chunk_ids:
+                    self.collection.delete(ids=chunk_ids)
+                    self._generation += 1
+                    if self.pq_index is not None:
+                        self.pq_index.remove(chunk_ids)
+            
+            if chunk_ids:
+                self._schedule_maintenance()
+                logger.info(f"Deleted {len(chunk_ids)} chunks for paper {paper_id}")
                 return True
             else:
                 logger.warning(f"No chunks found for paper {paper_id}")
@@ -194,6 +744,28 @@ class VectorStore:
             logger.error(f"Error deleting paper: {e}")
             return False
     
+    def _cached_count(self, name: str, compute) -> int:
+        """
+        Return a count, recomputing it only if the store was written since it was cached
+        
+        Parameters:
+            name: Cache slot
+            compute: Callable returning the current value
+        
+        Returns:
+            Count
+        """
+        generation = self._generation
+        cached = self._counts.get(name)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        
+        # Tagged with the generation read before computing, so a write that
+        # lands meanwhile makes the next call recompute
+        value = compute()
+        self._counts[name] = (generation, value)
+        return value
+    
     def count_documents(self) -> int:
         """
         Count total documents in the vector store
@@ -202,11 +774,33 @@ class VectorStore:
             Number of documents
         """
         try:
-            return self.collection.count()
+            return self._cached_count('documents', self.collection.count)
         except Exception as e:
             logger.error(f"Error counting documents: {e}")
             return 0
     
+    def count_papers(self) -> int:
+        """
+        Count distinct papers in the vector store
+        
+        Returns:
+            Number of papers
+        """
+        try:
+            return self._cached_count('papers', self._count_papers)
+        except Exception as e:
+            logger.error(f"Error counting papers: {e}")
+            return 0
+    
+    def _count_papers(self) -> int:
+        """Count distinct paper IDs in SQLite, or by listing papers if Chroma's schema differs"""
+        try:
+            with closing(self._connect_readonly()) as conn:
+                return conn.execute(_COUNT_PAPERS_SQL, (str(self.collection.id),)).fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Could not count papers in SQLite, listing them instead: {e}")
+            return len(self.list_papers())
+    
     def reset(self) -> bool:
         """
         Reset the entire vector store (use with caution!)
@@ -215,11 +809,19 @@ class VectorStore:
             True if successful
         """
         try:
-            self.client.delete_collection(name=self.collection_name)
-            self.collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={"description": "Academic paper chunks with embeddings"}
-            )
+            with self._write_lock:
+                self.client.delete_collection(name=self.collection_name)
+                
+                # Start over at full dimension; PCA is refitted once the store refills
+                self._active = (
+                    self.client.create_collection(name=COLLECTION_NAME, metadata=COLLECTION_METADATA),
+                    None
+                )
+                self._generation += 1
+                if self.pca is not None:
+                    self.pca.reset()
+                if self.pq_index is not None:
+                    self.pq_index.reset()
             logger.warning("Vector store has been reset!")
             return True
         except Exception as e: